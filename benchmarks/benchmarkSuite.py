@@ -0,0 +1,152 @@
+# benchmark suite that times every stage of a delivery day in main.py separately on synthetic data from generateData.py
+# usage: python3 benchmarks/benchmarkSuite.py [--addresses N] [--packages N] [--seed S] [--repeat R] [--save baseline.json] [--baseline baseline.json] [--tolerance 0.25]
+# every stage reports its best time out of the repeats and the peak memory it allocated, measured in a separate run because tracing allocations slows everything down
+# --save writes the results as a JSON baseline, and --baseline compares the results with an earlier baseline made with the same settings and exits with status 1
+# if any stage got slower or used more memory by more than the tolerance
+# the hot path counters of the trucks are reported for one more run of the same loads through the fleet engine, which drives the trucks the way main.py does
+import argparse
+import copy
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import FleetEngine, PackageHashTable, Truck, TRUCK_MAX_PACKAGES, loadAddressData, loadDistanceData, loadPackageData
+from generateData import generateData
+
+
+# run setup before every run without timing it, and return the best seconds of run over repeat runs and the peak bytes allocated by one more traced run
+def measure(setup, run, repeat):
+    bestSeconds = math.inf
+    for attempt in range(repeat):
+        arguments = setup()
+        start = time.perf_counter()
+        run(arguments)
+        bestSeconds = min(bestSeconds, time.perf_counter() - start)
+    arguments = setup()
+    tracemalloc.start()
+    run(arguments)
+    peakBytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': bestSeconds, 'peakBytes': peakBytes}
+
+
+# loads of the next TRUCK_MAX_PACKAGES packages in package ID order as (truck ID, list of package IDs) tuples
+def truckLoads(packageTable):
+    packIDs = sorted(packageTable.packIDs[row] for row in packageTable.index)
+    return [(truID, packIDs[start:start + TRUCK_MAX_PACKAGES]) for truID, start in enumerate(range(0, len(packIDs), TRUCK_MAX_PACKAGES), start=1)]
+
+
+# trucks that each carry one of the loads of truckLoads and have no time limit
+def loadTrucks(packageTable):
+    return [Truck(truID, 0, math.inf, packsID, packageTable, None, False) for truID, packsID in truckLoads(packageTable)]
+
+
+def runSuite(folder, repeat):
+    addressFile, distanceFile, packageFile = (os.path.join(folder, name) for name in ('addressCSV.csv', 'distanceCSV.csv', 'packageCSV.csv'))
+    addressTable = loadAddressData(addressFile)
+    distanceTable = loadDistanceData(len(addressTable), distanceFile) # also writes the binary cache for the cached load below
+    packageTable = loadPackageData(addressTable, packageFile)
+    packIDs = [packageTable.packIDs[row] for row in packageTable.index]
+    chainedTable = PackageHashTable()
+    chainedTable.addAll(list(packageTable))
+
+    def freshTrucks():
+        return loadTrucks(copy.deepcopy(packageTable))
+
+    def deliveredTrucks():
+        trucks = freshTrucks()
+        for truck in trucks:
+            truck.deliver(distanceTable)
+        return trucks
+
+    def getAll(table):
+        for packID in packIDs:
+            table.get(packID)
+
+    def deliverAll(trucks):
+        for truck in trucks:
+            truck.deliver(distanceTable)
+
+    def recallAll(trucks):
+        for truck in trucks:
+            truck.recall(distanceTable)
+
+    stages = {
+        'loadAddressData': (lambda: None, lambda arguments: loadAddressData(addressFile)),
+        'loadDistanceData': (lambda: None, lambda arguments: loadDistanceData(len(addressTable), distanceFile, useCache=False)),
+        'loadDistanceData cached': (lambda: None, lambda arguments: loadDistanceData(len(addressTable), distanceFile)),
+        'loadPackageData': (lambda: None, lambda arguments: loadPackageData(addressTable, packageFile)),
+        'PackageHashTable.get': (lambda: chainedTable, getAll),
+        'OpenAddressingPackageHashTable.get': (lambda: packageTable.index, getAll),
+        'Truck.deliver': (freshTrucks, deliverAll),
+        'Truck.recall': (deliveredTrucks, recallAll),
+    }
+    results = dict()
+    for name, (setup, run) in stages.items():
+        results[name] = measure(setup, run, repeat)
+        print(f"{name:<36}{1000 * results[name]['seconds']:>12.3f} ms{results[name]['peakBytes'] / 2 ** 20:>12.2f} MiB peak")
+
+    truckCargo = [(truID, packsID, 0) for truID, packsID in truckLoads(packageTable)]
+    engine = FleetEngine(copy.deepcopy(packageTable), distanceTable, truckCargo, [], math.inf, counters=True)
+    engine.run()
+    counters = engine.counterReport()
+    engine.printCounters()
+    return results, counters
+
+
+# print how every stage compares with the baseline and return the stages that regressed by more than the tolerance
+# a slowdown of less than a millisecond is never counted, because stages that fast mostly measure timer noise
+def compareWithBaseline(results, baseline, tolerance):
+    regressions = list()
+    for name, result in results.items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]
+        timeRatio = result['seconds'] / before['seconds'] if before['seconds'] > 0 else 1.0
+        memoryRatio = result['peakBytes'] / before['peakBytes'] if before['peakBytes'] > 0 else 1.0
+        regressed = (timeRatio > 1 + tolerance and result['seconds'] - before['seconds'] > 0.001) or memoryRatio > 1 + tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<36}{timeRatio:>8.2f}x time{memoryRatio:>8.2f}x memory{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='time every stage of a delivery day on synthetic data')
+    parser.add_argument('--addresses', type=int, default=1000)
+    parser.add_argument('--packages', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', help='write the results to this JSON baseline file')
+    parser.add_argument('--baseline', help='compare the results with this JSON baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown or memory growth before a stage counts as a regression')
+    arguments = parser.parse_args()
+
+    settings = {'addresses': arguments.addresses, 'packages': arguments.packages, 'seed': arguments.seed}
+    print(f"{arguments.addresses} addresses, {arguments.packages} packages, seed {arguments.seed}, best of {arguments.repeat}")
+    with tempfile.TemporaryDirectory() as folder:
+        generateData(folder, arguments.addresses, arguments.packages, arguments.seed)
+        results, counters = runSuite(folder, arguments.repeat)
+    print()
+
+    regressions = list()
+    if arguments.baseline:
+        with open(arguments.baseline, mode='r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline['settings'] != settings:
+            print(f"baseline was made with {baseline['settings']}, not comparing")
+        else:
+            regressions = compareWithBaseline(results, baseline, arguments.tolerance)
+        print()
+    if arguments.save:
+        with open(arguments.save, mode='w', encoding='utf-8') as file:
+            json.dump({'settings': settings, 'python': platform.python_version(), 'results': results, 'counters': counters}, file, indent=2)
+        print(f"saved baseline to {arguments.save}")
+    if regressions:
+        sys.exit(1)
@@ -0,0 +1,46 @@
+# seeded generator of synthetic address, distance and package csv files in the same format as the files in csv/
+# usage: python3 benchmarks/generateData.py output folder [number of addresses] [number of packages] [seed]
+# addresses are random points in a square that grows with the number of addresses, the first address is the hub at the center, and distances are the straight line miles rounded to a tenth
+# the distance file only holds the lower triangle of the matrix like csv/distanceCSV.csv, about a fifth of the packages get a 9:00 AM or 10:30 AM deadline
+# the same arguments always produce the same files
+import math
+import os
+import random
+import sys
+
+streetNames = ['Main St', 'State St', 'Oakland Ave', 'Canyon Rd', 'Dalton Ave', 'Pioneer Rd', 'Valley Central Hwy', 'Bringhurst St', 'Taylorsville Blvd', 'Gentry Ave']
+cities = ['Salt Lake City', 'West Valley City', 'Holladay', 'Murray', 'Millcreek']
+deadlines = ['EOD', '10:30 AM', '9:00 AM']
+
+
+def generateData(outputFolder, addressCount, packageCount, seed=0):
+    random.seed(seed)
+    side = max(10.0, math.sqrt(addressCount) / 2) # keeps the number of addresses per square mile about the same at every scale
+    points = [(side / 2, side / 2)] + [(random.uniform(0, side), random.uniform(0, side)) for i in range(addressCount - 1)]
+    addresses = [f"{index * 10 + 1} {streetNames[index % len(streetNames)]}" for index in range(addressCount)] # the number makes every address unique
+    zipcodes = [str(84100 + random.randrange(60)) for index in range(addressCount)]
+    addressCities = [random.choice(cities) for index in range(addressCount)]
+    os.makedirs(outputFolder, exist_ok=True)
+
+    with open(os.path.join(outputFolder, 'addressCSV.csv'), mode='w', encoding='utf-8') as file:
+        file.writelines(f"{address}\n" for address in addresses)
+
+    with open(os.path.join(outputFolder, 'distanceCSV.csv'), mode='w', encoding='utf-8') as file:
+        emptyColumns = ',' * (addressCount - 1)
+        for rowIndex, start in enumerate(points):
+            distances = ','.join(f"{round(math.dist(start, end), 1)}" for end in points[:rowIndex + 1])
+            file.write(f"{distances}{emptyColumns[:addressCount - rowIndex - 1]}\n")
+
+    with open(os.path.join(outputFolder, 'packageCSV.csv'), mode='w', encoding='utf-8') as file:
+        for packID in range(1, packageCount + 1):
+            addressIndex = random.randrange(1, addressCount)
+            deadline = random.choices(deadlines, weights=[80, 15, 5])[0]
+            file.write(f"{packID},{addresses[addressIndex]},{addressCities[addressIndex]},UT,{zipcodes[addressIndex]},{deadline},{random.randint(1, 90)}\n")
+
+
+if __name__ == '__main__':
+    outputFolder = sys.argv[1]
+    arguments = [int(arg) for arg in sys.argv[2:]]
+    addressCount, packageCount, seed = (arguments + [1000, 10000, 0][len(arguments):])[:3]
+    generateData(outputFolder, addressCount, packageCount, seed)
+    print(f"wrote {addressCount} addresses and {packageCount} packages to {outputFolder}")
@@ -0,0 +1,95 @@
+# microbenchmark comparing the original fixed size chained package hash table with the resizing chained table and the open addressing table from main.py
+# usage: python3 benchmarks/hashTableBenchmark.py [number of packages ...]
+# for every table it reports how long it takes to load the packages, the average time of a lookup, and the memory used by the table itself (the packages are shared by all tables so they are not counted)
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import Package, PackageHashTable, OpenAddressingPackageHashTable
+
+
+# copy of the original hash table, 40 fixed buckets and a lookup that scans the whole bucket even after it finds a match
+class LegacyPackageHashTable:
+    def __init__(self, size=40):
+        self.size = size
+        self.table = []
+        for i in range(size):
+            self.table.append([])
+
+    def _hash(self, packID):
+        return (packID - 1) % self.size
+
+    def add(self, package):
+        bucket = self._hash(package.packID)
+        self.table[bucket].append(package)
+
+    def get(self, packID):
+        bucket = self._hash(packID)
+        result = None
+        for package in self.table[bucket]:
+            if package.packID == packID:
+                result = package
+        return result
+
+
+# build a table by adding the packages one at a time, or through addAll when bulk is True
+def fillTable(tableClass, packages, bulk):
+    table = tableClass()
+    if bulk:
+        table.addAll(packages)
+    else:
+        for package in packages:
+            table.add(package)
+    return table
+
+
+# build a table and return the table, the seconds it took and the bytes it holds on to
+# the table is built twice because tracing allocations slows the build down too much to time it at the same time
+def buildTable(tableClass, packages, bulk):
+    start = time.perf_counter()
+    table = fillTable(tableClass, packages, bulk)
+    seconds = time.perf_counter() - start
+    del table
+    tracemalloc.start()
+    table = fillTable(tableClass, packages, bulk)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return table, seconds, size
+
+
+# average seconds per lookup over the given package IDs
+def timeLookups(table, packIDs):
+    start = time.perf_counter()
+    for packID in packIDs:
+        table.get(packID)
+    return (time.perf_counter() - start) / len(packIDs)
+
+
+def runBenchmark(packageCount):
+    packages = [Package(packID, '4001 South 700 East', 0, 'Salt Lake City', 'UT', '84107', 'EOD', 1, 'At hub', 'N/A') for packID in range(1, packageCount + 1)]
+    random.seed(packageCount)
+    # the legacy table scans packageCount / 40 packages per lookup, so it only gets a small sample of lookups to keep the benchmark short
+    lookupIDs = [random.randint(1, packageCount) for i in range(min(packageCount, 200000))]
+    legacyLookupIDs = lookupIDs[:max(1, min(len(lookupIDs), 4000000 // packageCount))]
+
+    print(f"{packageCount} packages")
+    print(f"{'table':<34}{'load (s)':>12}{'lookup (us)':>14}{'table bytes':>14}{'bytes/package':>15}")
+    for name, tableClass, bulk, ids in (
+        ('legacy chained (40 buckets)', LegacyPackageHashTable, False, legacyLookupIDs),
+        ('chained, resizing', PackageHashTable, False, lookupIDs),
+        ('chained, resizing, bulk load', PackageHashTable, True, lookupIDs),
+        ('open addressing', OpenAddressingPackageHashTable, False, lookupIDs),
+        ('open addressing, bulk load', OpenAddressingPackageHashTable, True, lookupIDs),
+    ):
+        table, loadSeconds, tableBytes = buildTable(tableClass, packages, bulk)
+        lookupSeconds = timeLookups(table, ids)
+        print(f"{name:<34}{loadSeconds:>12.3f}{lookupSeconds * 1e6:>14.3f}{tableBytes:>14}{tableBytes / packageCount:>15.1f}")
+    print()
+
+
+if __name__ == '__main__':
+    for packageCount in [int(arg) for arg in sys.argv[1:]] or [40, 10000, 1000000]:
+        runBenchmark(packageCount)
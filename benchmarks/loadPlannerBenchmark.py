@@ -0,0 +1,59 @@
+# benchmark for the load planner in main.py on a synthetic manifest
+# usage: python3 benchmarks/loadPlannerBenchmark.py [number of packages] [number of addresses] [number of trucks]
+# addresses are random points in a 10 by 10 mile square with the hub at the center, about a fifth of the packages get a 9:00 AM or 10:30 AM deadline and about one in twenty arrives at the hub late
+# it reports how long planning takes, then runs the plan through the fleet engine and reports the mileage and the number of packages delivered after their deadline, by deadline
+# with the default 40 trucks the morning deadlines need more trips before 10:30 AM than the fleet can drive, so packages are late on any plan, with 160 trucks none are
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import AddressTable, DenseDistanceTable, FleetEngine, PackageStore, convertSecondsToTime, planLoads, AT_HUB
+
+
+def generateDay(packageCount, addressCount, truckCount, seed=0):
+    random.seed(seed)
+    points = [(5.0, 5.0)] + [(random.uniform(0, 10), random.uniform(0, 10)) for i in range(addressCount - 1)]
+    distanceTable = DenseDistanceTable([[round(math.dist(start, end), 1) for end in points] for start in points])
+    addressTable = AddressTable([f"{index} Synthetic St" for index in range(addressCount)])
+    packageTable = PackageStore(addressTable)
+    packages = list()
+    disruptions = [('truck', 0, truID) for truID in range(1, truckCount + 1)]
+    for packID in range(1, packageCount + 1):
+        deadline = random.choices(['EOD', '10:30 AM', '9:00 AM'], weights=[80, 15, 5])[0]
+        packages.append((packID, random.randrange(1, addressCount), 'Salt Lake City', 'UT', '84101', deadline, random.randint(1, 90), AT_HUB))
+        if deadline == 'EOD' and random.random() < 0.05:
+            disruptions.append(('arrival', 3900, packID))
+    packageTable.addAll(packages)
+    return packageTable, distanceTable, disruptions
+
+
+def runBenchmark(packageCount, addressCount, truckCount):
+    packageTable, distanceTable, disruptions = generateDay(packageCount, addressCount, truckCount)
+
+    start = time.perf_counter()
+    truckCargo = planLoads(packageTable, distanceTable, disruptions)
+    planSeconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trucks = FleetEngine(packageTable, distanceTable, truckCargo, disruptions, math.inf).run()
+    simulateSeconds = time.perf_counter() - start
+
+    latePackages = dict()
+    for row in packageTable.index:
+        if packageTable.deliverySeconds[row] > packageTable.deadlineSeconds[row]:
+            deadline = packageTable.strings[packageTable.deadlines[row]]
+            latePackages[deadline] = latePackages.get(deadline, 0) + 1
+    lastReturn = max(truck.elapsedSeconds for truck in trucks)
+    print(f"{packageCount} packages, {addressCount} addresses, {truckCount} trucks")
+    print(f"planned {len(truckCargo)} trips in {planSeconds:.3f} seconds, simulated in {simulateSeconds:.3f} seconds")
+    print(f"total mileage {round(sum(truck.mileage for truck in trucks), 1)}, last truck back at {convertSecondsToTime(lastReturn)}, {sum(latePackages.values())} late packages {latePackages}")
+    print()
+
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    packageCount, addressCount, truckCount = (arguments + [10000, 2000, 40][len(arguments):])[:3]
+    runBenchmark(packageCount, addressCount, truckCount)
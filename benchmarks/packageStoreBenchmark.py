@@ -0,0 +1,78 @@
+# memory benchmark comparing Package objects stored in the package hash table with the columnar package store from main.py
+# usage: python3 benchmarks/packageStoreBenchmark.py [number of packages ...]
+# the packages are parsed from generated csv text the same way loadPackageData reads csv/packageCSV.csv, so every field starts out as its own string just like in the real loader
+import csv
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import Package, PackageHashTable, PackageStore, AT_HUB
+
+
+def generateRows(packageCount, addressTable):
+    random.seed(packageCount)
+    cities = ['Salt Lake City', 'West Valley City', 'Holladay', 'Murray', 'Millcreek']
+    deadlines = ['EOD', 'EOD', 'EOD', '10:30 AM', '9:00 AM']
+    lines = list()
+    for packID in range(1, packageCount + 1):
+        addressIndex = random.randrange(len(addressTable))
+        lines.append(f"{packID},{addressTable[addressIndex]},{random.choice(cities)},UT,{84100 + addressIndex % 40},{random.choice(deadlines)},{random.randint(1, 90)}\n")
+    return ''.join(lines)
+
+
+# load the packages the way loadPackageData did before the package store, one Package object per package in a package hash table
+def loadObjects(csvText, addressIndexes):
+    packageTable = PackageHashTable()
+    packages = list()
+    for row in csv.reader(io.StringIO(csvText)):
+        packages.append(Package(int(row[0]), row[1], addressIndexes[row[1]], row[2], row[3], row[4], row[5], int(row[6]), 'At hub', 'N/A'))
+    packageTable.addAll(packages)
+    return packageTable
+
+
+# load the packages into the columnar package store the way loadPackageData does now
+def loadStore(csvText, addressIndexes, addressTable):
+    packageTable = PackageStore(addressTable)
+    packages = list()
+    for row in csv.reader(io.StringIO(csvText)):
+        packages.append((int(row[0]), addressIndexes[row[1]], row[2], row[3], row[4], row[5], int(row[6]), AT_HUB))
+    packageTable.addAll(packages)
+    return packageTable
+
+
+# load the packages and return the seconds it took and the bytes the loaded table holds on to, timing and tracing are done in separate runs since tracing slows the load down
+def measure(load):
+    start = time.perf_counter()
+    table = load()
+    seconds = time.perf_counter() - start
+    del table
+    tracemalloc.start()
+    table = load()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, size, peak
+
+
+def runBenchmark(packageCount):
+    addressTable = [f"{number} S {number % 90 * 100} E" for number in range(1, 1001)]
+    addressIndexes = {address: index for index, address in enumerate(addressTable)}
+    csvText = generateRows(packageCount, addressTable)
+
+    print(f"{packageCount} packages")
+    print(f"{'storage':<34}{'load (s)':>12}{'bytes/package':>15}{'peak bytes/package':>20}")
+    for name, load in (
+        ('Package objects in hash table', lambda: loadObjects(csvText, addressIndexes)),
+        ('columnar package store', lambda: loadStore(csvText, addressIndexes, addressTable)),
+    ):
+        seconds, size, peak = measure(load)
+        print(f"{name:<34}{seconds:>12.3f}{size / packageCount:>15.1f}{peak / packageCount:>20.1f}")
+    print()
+
+
+if __name__ == '__main__':
+    for packageCount in [int(arg) for arg in sys.argv[1:]] or [40, 100000, 1000000]:
+        runBenchmark(packageCount)
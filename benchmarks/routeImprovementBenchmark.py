@@ -0,0 +1,41 @@
+# benchmark for the route improvement in main.py on a synthetic manifest
+# usage: python3 benchmarks/routeImprovementBenchmark.py [number of packages] [number of addresses] [packages per truck]
+# the day is generated the same way as in loadPlannerBenchmark.py and loaded by the load planner, then the fleet engine runs it once with plain nearest neighbor routes and once for every route time budget
+# it reports the mileage gained against the time spent improving routes, and the number of packages delivered after their deadline
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import FleetEngine, planLoads
+from loadPlannerBenchmark import generateDay
+
+
+def runDay(packageCount, addressCount, maxPackages, improveRoutes, routeSeconds):
+    packageTable, distanceTable, disruptions = generateDay(packageCount, addressCount, packageCount // maxPackages + 1)
+    truckCargo = planLoads(packageTable, distanceTable, disruptions, maxPackages)
+    engine = FleetEngine(packageTable, distanceTable, truckCargo, disruptions, math.inf, improveRoutes=improveRoutes, routeSeconds=routeSeconds, maxPackages=maxPackages)
+    start = time.perf_counter()
+    trucks = engine.run()
+    simulateSeconds = time.perf_counter() - start
+    latePackages = sum(1 for row in packageTable.index if packageTable.deliverySeconds[row] > packageTable.deadlineSeconds[row])
+    return round(sum(truck.mileage for truck in trucks), 1), engine.routeImprovementSeconds, simulateSeconds, latePackages, len(truckCargo)
+
+
+def runBenchmark(packageCount, addressCount, maxPackages):
+    mileage, improveSeconds, simulateSeconds, latePackages, trips = runDay(packageCount, addressCount, maxPackages, False, 0)
+    print(f"{packageCount} packages, {addressCount} addresses, up to {maxPackages} packages on each of {trips} trips")
+    print(f"nearest neighbor: {mileage} miles, simulated in {simulateSeconds:.3f} seconds, {latePackages} late packages")
+    for routeSeconds in (0.001, 0.01, 0.05, 0.2):
+        improvedMileage, improveSeconds, simulateSeconds, latePackages, trips = runDay(packageCount, addressCount, maxPackages, True, routeSeconds)
+        gained = mileage - improvedMileage
+        print(f"budget {routeSeconds} seconds per truck: {improvedMileage} miles, {gained:.1f} miles ({100 * gained / mileage:.1f}%) gained in {improveSeconds:.3f} seconds "
+              f"({gained / max(improveSeconds, 1e-9):.0f} miles per second), {latePackages} late packages")
+    print()
+
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    packageCount, addressCount, maxPackages = (arguments + [5000, 2000, 100][len(arguments):])[:3]
+    runBenchmark(packageCount, addressCount, maxPackages)
@@ -0,0 +1,39 @@
+# benchmark for the parallel scenario sweep in main.py on a synthetic manifest
+# usage: python3 benchmarks/scenarioSweepBenchmark.py [number of packages] [number of addresses] [number of scenarios]
+# the day is generated the same way as in loadPlannerBenchmark.py, and the same scenarios are run with 1 worker process, then with twice as many up to the number of cores
+# it reports the scenarios per second and the speedup over a single worker, which should be close to the number of workers
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import END_OF_DAY_SECONDS, runScenarioSweep
+from loadPlannerBenchmark import generateDay
+
+
+def runBenchmark(packageCount, addressCount, scenarioCount):
+    packageTable, distanceTable, disruptions = generateDay(packageCount, addressCount, 1)
+    grid = itertools.product([(0,), (0, 3900), (0, 0, 3900, 3900)], range(packageCount // 400 + 1, packageCount // 100 + 2), [16, 24, 32], [14400, END_OF_DAY_SECONDS])
+    scenarios = list(itertools.islice(itertools.cycle(grid), scenarioCount))
+    print(f"{packageCount} packages, {addressCount} addresses, {len(scenarios)} scenarios on {os.cpu_count()} cores")
+
+    processes = 1
+    baseline = None
+    while True:
+        start = time.perf_counter()
+        results = runScenarioSweep(scenarios, packageTable, distanceTable, disruptions, processes)
+        throughput = len(results) / (time.perf_counter() - start)
+        baseline = baseline or throughput
+        print(f"{processes} workers: {throughput:.1f} scenarios per second, {throughput / baseline:.2f}x speedup")
+        if processes >= (os.cpu_count() or 1):
+            break
+        processes = min(2 * processes, os.cpu_count())
+    print(f"lowest mileage {min(result['mileage'] for result in results)}, fewest late packages {min(result['latePackages'] for result in results)}")
+    print()
+
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    packageCount, addressCount, scenarioCount = (arguments + [2000, 500, 48][len(arguments):])[:3]
+    runBenchmark(packageCount, addressCount, scenarioCount)
@@ -0,0 +1,84 @@
+# load test for the status service in main.py
+# usage: python3 benchmarks/statusServiceLoadTest.py [number of connections] [seconds] [port]
+# if nothing is listening on the port yet, a local instance is started with python3 main.py --serve and stopped again at the end
+# every connection keeps sending a random mix of package, all packages and mileage queries at random times, and the script reports requests per second and the p50 and p99 latency
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+mainDirectory = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def randomTarget():
+    userTime = f"{random.randint(8, 16)}:{random.randint(0, 59):02d}:{random.randint(0, 59):02d}"
+    kind = random.choices(['package', 'packages', 'mileage'], weights=[80, 10, 10])[0]
+    if kind == 'package':
+        return f"/package?id={random.randint(1, 40)}&time={userTime}"
+    return f"/{kind}?time={userTime}"
+
+
+async def runConnection(port, stopTime, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    while time.perf_counter() < stopTime:
+        start = time.perf_counter()
+        writer.write(f"GET {randomTarget()} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        contentLength = 0
+        while True:
+            header = await reader.readline()
+            if header in (b'\r\n', b''):
+                break
+            if header.lower().startswith(b'content-length:'):
+                contentLength = int(header.split(b':')[1])
+        await reader.readexactly(contentLength)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def waitForService(port, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def runLoadTest(connectionCount, seconds, port):
+    latencies = list()
+    stopTime = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(runConnection(port, stopTime, latencies) for connection in range(connectionCount)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{connectionCount} connections for {seconds} seconds: {len(latencies)} requests, {len(latencies) / elapsed:.0f} requests per second")
+    print(f"p50 latency {1000 * latencies[len(latencies) // 2]:.2f} ms, p99 latency {1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:.2f} ms")
+    print()
+
+
+def main(connectionCount, seconds, port):
+    service = None
+    try:
+        asyncio.run(waitForService(port, timeout=0))
+    except OSError:
+        service = subprocess.Popen([sys.executable, 'main.py', '--serve', str(port)], cwd=mainDirectory, stdout=subprocess.DEVNULL)
+        asyncio.run(waitForService(port))
+    try:
+        asyncio.run(runLoadTest(connectionCount, seconds, port))
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    connectionCount, seconds, port = (arguments + [32, 5, 8765][len(arguments):])[:3]
+    main(connectionCount, seconds, port)
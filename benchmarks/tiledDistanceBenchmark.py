@@ -0,0 +1,54 @@
+# benchmark for the tiled distance table in main.py on a synthetic manifest with far more addresses than a dense distance table could hold
+# usage: python3 benchmarks/tiledDistanceBenchmark.py [number of addresses] [number of packages] [tiles kept in the cache] [tile size]
+# addresses are random points in a square that grows with the number of addresses and their distances are computed from the coordinates by the tiled distance table
+# it plans and simulates the day and reports the time, the peak memory of a second traced run, the tile cache statistics and how much memory a dense table would have taken
+import copy
+import math
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from main import AddressTable, FleetEngine, PackageStore, coordinateDistanceTable, planLoads, AT_HUB
+
+
+def generateDay(addressCount, packageCount):
+    random.seed(0)
+    side = max(10.0, math.sqrt(addressCount) / 2)
+    points = [(side / 2, side / 2)] + [(random.uniform(0, side), random.uniform(0, side)) for i in range(addressCount - 1)]
+    packageTable = PackageStore(AddressTable([f"{index} Synthetic St" for index in range(addressCount)]))
+    packageTable.addAll([(packID, random.randrange(1, addressCount), 'Salt Lake City', 'UT', '84101', 'EOD', 1, AT_HUB) for packID in range(1, packageCount + 1)])
+    disruptions = [('truck', 0, truID) for truID in range(1, packageCount // 16 + 2)]
+    return points, packageTable, disruptions
+
+
+def runDay(points, packageTable, disruptions, cacheTiles, tileSize):
+    distanceTable = coordinateDistanceTable(points, tileSize, cacheTiles)
+    truckCargo = planLoads(packageTable, distanceTable, disruptions)
+    trucks = FleetEngine(packageTable, distanceTable, truckCargo, disruptions, math.inf).run()
+    return distanceTable, truckCargo, trucks
+
+
+def runBenchmark(addressCount, packageCount, cacheTiles, tileSize):
+    points, packageTable, disruptions = generateDay(addressCount, packageCount)
+    start = time.perf_counter()
+    distanceTable, truckCargo, trucks = runDay(points, copy.deepcopy(packageTable), disruptions, cacheTiles, tileSize)
+    seconds = time.perf_counter() - start
+    tracemalloc.start() # the peak memory is measured in a second run, because tracing allocations slows everything down
+    runDay(points, packageTable, disruptions, cacheTiles, tileSize)
+    peakBytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    stats = distanceTable.cacheStats()
+    print(f"{addressCount} addresses, {packageCount} packages, {cacheTiles} tiles of {tileSize} by {tileSize} in the cache")
+    print(f"planned and simulated {len(truckCargo)} trips in {seconds:.2f} seconds, total mileage {round(sum(truck.mileage for truck in trucks), 1)}")
+    print(f"peak memory {peakBytes / 2 ** 20:.1f} MiB with {stats['cacheBytes'] / 2 ** 20:.1f} MiB of cached tiles, a dense table would take {8 * addressCount * addressCount / 2 ** 30:.1f} GiB")
+    print(f"tile cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, {100 * stats['hitRate']:.1f}% hit rate")
+    print()
+
+if __name__ == '__main__':
+    arguments = [int(arg) for arg in sys.argv[1:]]
+    addressCount, packageCount, cacheTiles, tileSize = (arguments + [100000, 1000, 65536, 8][len(arguments):])[:4]
+    runBenchmark(addressCount, packageCount, cacheTiles, tileSize)
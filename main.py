@@ -1,11 +1,43 @@
+import array # import array to store the package IDs of the open addressing hash table compactly
+import asyncio # import asyncio to serve status queries from the status service concurrently
+import bisect # import bisect to binary search the time-sorted event log of the delivery timeline
+import copy # import copy to snapshot the package store before the delivery timeline simulates the day
 import csv # import csv for reading text from csv files
+import heapq # import heapq for the priority queue of the fleet engine
+import itertools # import itertools to expand the scenario grid of a scenario sweep
+import json # import json to serialize the answers of the status service
 import math # import math to use ceiling function to add floats properly
+import mmap # import mmap to memory map the binary cache of the distance table
+import os # import os to check the modification time of the distance csv file and to replace the cache file atomically
+import struct # import struct to read and write the header of the binary distance table cache
+import sys # import sys to read command line flags such as --timeline
+import tempfile # import tempfile to build the distance tile file in the temporary folder when the csv folder can't be written
+import time # import time to report how long the load planner takes
+from urllib.parse import parse_qs, urlsplit # import urlsplit and parse_qs to read the path and query of a status service request
+from concurrent.futures import ProcessPoolExecutor # import ProcessPoolExecutor to run the scenarios of a scenario sweep on every core
+from collections import OrderedDict # import OrderedDict for the bounded cache of serialized answers of the status service
+from multiprocessing import shared_memory # import shared_memory so the workers of a scenario sweep share one copy of the distance table
 
+END_OF_DAY_SECONDS = 32400 # 17:00:00, which is what an 'EOD' deadline means
+TRUCK_MAX_PACKAGES = 16 # maximum amount of packages a truck can hold at once
 
+# status codes kept by the package store, the status string such as 'En Route (Truck 2)' is only built when a package is displayed
+AT_HUB = 0
+DELAYED_ON_FLIGHT = 1
+EN_ROUTE = 2
+DELIVERED = 3
+
+
+# chained hash table of Package objects with get, add, update, delete, iteration and printing
+# the simulation itself keeps its packages in the columnar package store further down, which indexes them with the open addressing variant below,
+# this table stays as the general purpose package table for code working with Package objects, and as the base class the open addressing variant gets its printing and length from
 class PackageHashTable:
     # default size is 40, create an outer list and have it store multiple inner lists in the table attribute
-    def __init__(self, size=40):
+    # once the number of packages grows past size * loadFactor the table doubles its number of buckets so the inner lists stay short no matter how many packages are loaded
+    def __init__(self, size=40, loadFactor=1.0):
         self.size = size
+        self.loadFactor = loadFactor
+        self.count = 0 # number of packages currently stored in the table
         self.table = []
         for i in range(size):
             self.table.append([])
@@ -14,40 +46,230 @@ class PackageHashTable:
     def _hash(self, packID):
         return (packID - 1) % self.size
 
+    # rebuild the table with newSize buckets and rehash every package into it, since package IDs are sequential they still end up in ascending order across the buckets
+    def _resize(self, newSize):
+        oldTable = self.table
+        self.size = newSize
+        self.table = []
+        for i in range(newSize):
+            self.table.append([])
+        for bucket in oldTable:
+            for package in bucket:
+                self.table[self._hash(package.packID)].append(package)
+
+    # put the package into its bucket, replacing a package that already has the same package ID, and return True if a new package was added
+    def _insert(self, package):
+        bucket = self.table[self._hash(package.packID)]
+        for index, existing in enumerate(bucket):
+            if existing.packID == package.packID:
+                bucket[index] = package
+                return False
+        bucket.append(package)
+        self.count += 1
+        return True
+
     # to add a package, get the package ID from the package which will be used as a key for the hash table, then throw it into the hash function to get the bucket/index of which list to append the package to
     # my hash table is a self-adjusting data structure that utilizes chaining because even if the hash function maps 2 packages to the same bucket/index, the inner list simply grows as both packages get appended to the same inner list
+    # when the table gets too full it doubles in size, so the inner lists stay a package or two long on average
     # this should fulfill part A because a package object contains all the information such as address, deadline, city, zipcode, weight, status, etc. as its attributes, and the entire package object is stored in the hash table
     def add(self, package):
-        bucket = self._hash(package.packID)
-        self.table[bucket].append(package)
+        if self._insert(package) and self.count > self.size * self.loadFactor:
+            self._resize(self.size * 2)
+
+    # bulk load a batch of packages by growing the table once up front to fit the whole batch instead of resizing several times along the way
+    def addAll(self, packages):
+        packages = list(packages)
+        newSize = self.size
+        while self.count + len(packages) > newSize * self.loadFactor:
+            newSize *= 2
+        if newSize != self.size:
+            self._resize(newSize)
+        for package in packages:
+            self._insert(package)
 
     # to get a package, find the bucket it resides in by using the hash function, then traverse that list and return the package that has a package ID matching the package ID provided to the function
+    # the search stops at the first match since a package ID is only ever stored once, and None is returned if the package is not in the table
     # this should fulfill part B because it returns the package object, and the package attributes can then be accessed to get delivery address, deadline, city, zipcode, weight, status, etc.
     def get(self, packID):
-        bucket = self._hash(packID)
-        result = None
-        for package in self.table[bucket]:
+        for package in self.table[self._hash(packID)]:
             if package.packID == packID:
-                result = package
-        return result
+                return package
+        return None
+
+    # replace the stored package that has the same package ID as the given package, returns False and leaves the table alone if there is no such package
+    def update(self, package):
+        if self.get(package.packID) is None:
+            return False
+        self._insert(package)
+        return True
+
+    # remove a package from the table and return it, or return None if the package is not in the table
+    def delete(self, packID):
+        bucket = self.table[self._hash(packID)]
+        for index, existing in enumerate(bucket):
+            if existing.packID == packID:
+                self.count -= 1
+                return bucket.pop(index)
+        return None
+
+    # iterate over every package in bucket order, which is ascending package ID order for sequential package IDs
+    def __iter__(self):
+        for bucket in self.table:
+            yield from bucket
+
+    def __len__(self):
+        return self.count
 
     # find a specific package by using the get method, then iterate through all the attributes in the package object and print it out for the user
     def printPackage(self, packID):
-        package = self.get(packID)
-        for key, value in package.__dict__.items():
-            print(f"{key}: {value}", end=" | ")
-        print()
+        printPackageInfo(self.get(packID))
         print()
 
     # iterate through all the buckets and for each bucket, print out every package in that bucket/inner list
     def printAll(self):
-        for bucket in self.table:
-            for package in bucket:
-                for key, value in package.__dict__.items():
-                    print(f"{key}: {value}", end=" | ")
-                print()
+        for package in self:
+            printPackageInfo(package)
         print()
 
+# compact version of the package hash table that uses open addressing with linear probing instead of chaining
+# package IDs are kept in a flat array of 64-bit integers and the packages in a parallel list, so there are no inner lists at all and a lookup is a short walk over neighbouring slots
+# a slot holding 0 has never been used and a slot holding -1 had its package deleted, which works because package IDs start at 1, so put rejects any other package ID
+# the number of slots is always a power of two and the table doubles once it is more than loadFactor full, counting deleted slots, so lookups stay O(1) even with millions of packages
+class OpenAddressingPackageHashTable(PackageHashTable):
+    def __init__(self, size=64, loadFactor=0.5):
+        self.size = 1
+        while self.size < size:
+            self.size *= 2
+        self.loadFactor = loadFactor
+        self.count = 0 # number of packages currently stored in the table
+        self.used = 0 # number of slots that hold a package or a deleted marker
+        self.keys = array.array('q', bytes(8 * self.size))
+        self.values = [None] * self.size
+
+    # same hash as the chained table, but masking works as the remainder since the size is a power of two
+    def _hash(self, packID):
+        return (packID - 1) & (self.size - 1)
+
+    # return the slot that holds packID, or -1 if it is not in the table
+    def _find(self, packID):
+        if packID <= 0: # 0 and -1 are the empty and deleted markers, so they must never match a slot
+            return -1
+        keys = self.keys
+        mask = self.size - 1
+        slot = (packID - 1) & mask
+        while True:
+            key = keys[slot]
+            if key == packID:
+                return slot
+            if key == 0:
+                return -1
+            slot = (slot + 1) & mask
+
+    def _resize(self, newSize):
+        oldKeys = self.keys
+        oldValues = self.values
+        self.size = newSize
+        self.keys = array.array('q', bytes(8 * newSize))
+        self.values = [None] * newSize
+        self.count = 0
+        self.used = 0
+        for slot in range(len(oldKeys)):
+            if oldKeys[slot] > 0:
+                self._insert(oldKeys[slot], oldValues[slot])
+
+    # store value under packID, replacing the value already stored for that package ID, and return True if a new package ID was added
+    def _insert(self, packID, value):
+        keys = self.keys
+        mask = self.size - 1
+        slot = (packID - 1) & mask
+        freeSlot = -1 # first deleted slot along the way which can be reused if the package turns out to be new
+        while True:
+            key = keys[slot]
+            if key == packID:
+                self.values[slot] = value
+                return False
+            if key == 0:
+                break
+            if key == -1 and freeSlot == -1:
+                freeSlot = slot
+            slot = (slot + 1) & mask
+        if freeSlot == -1:
+            freeSlot = slot
+            self.used += 1
+        keys[freeSlot] = packID
+        self.values[freeSlot] = value
+        self.count += 1
+        return True
+
+    # raise a ValueError for a package ID that is not a positive integer, since 0 and negative IDs would collide with the empty and deleted markers
+    @staticmethod
+    def _checkPackID(packID):
+        if not isinstance(packID, int) or packID <= 0:
+            raise ValueError(f"package ID must be a positive integer, got {packID!r}")
+
+    # the table can map a package ID to any value, not just a package object, which lets the package store use it to find the row of a package
+    # once the used slots pass the load factor the table is rebuilt, which drops the deleted markers, and it only doubles if the live packages fill more than half of the load factor
+    # so a table whose used slots are mostly deleted markers is rebuilt at the same size, and deleting and adding packages over and over doesn't grow it
+    def put(self, packID, value):
+        self._checkPackID(packID)
+        if self._insert(packID, value) and self.used > self.size * self.loadFactor:
+            self._resize(self.size * 2 if 2 * self.count > self.size * self.loadFactor else self.size)
+
+    # bulk version of put that takes a list of (package ID, value) pairs and grows the table once up front, sized for the live packages plus the new ones
+    def putAll(self, items):
+        for packID, value in items:
+            self._checkPackID(packID)
+        newSize = self.size
+        while self.count + len(items) > newSize * self.loadFactor:
+            newSize *= 2
+        if newSize != self.size or self.used + len(items) > newSize * self.loadFactor:
+            self._resize(newSize)
+        for packID, value in items:
+            self._insert(packID, value)
+
+    def add(self, package):
+        self.put(package.packID, package)
+
+    def addAll(self, packages):
+        self.putAll([(package.packID, package) for package in packages])
+
+    def get(self, packID):
+        slot = self._find(packID)
+        if slot == -1:
+            return None
+        return self.values[slot]
+
+    def update(self, package):
+        slot = self._find(package.packID)
+        if slot == -1:
+            return False
+        self.values[slot] = package
+        return True
+
+    def delete(self, packID):
+        slot = self._find(packID)
+        if slot == -1:
+            return None
+        package = self.values[slot]
+        self.keys[slot] = -1
+        self.values[slot] = None
+        self.count -= 1
+        return package
+
+    # iterate over every package in slot order, which is ascending package ID order for sequential package IDs
+    def __iter__(self):
+        keys = self.keys
+        values = self.values
+        for slot in range(self.size):
+            if keys[slot] > 0:
+                yield values[slot]
+
+# print every attribute of a single package on one line, this is shared by the hash table and the delivery timeline so both display packages the same way
+def printPackageInfo(package):
+    for key, value in package.__dict__.items():
+        print(f"{key}: {value}", end=" | ")
+    print()
+
 class Package:
     def __init__(self, packID, address, addressIndex, city, state, zipcode, deadline, weight, status, deliveryTime):
         self.packID = packID # unique package ID 
@@ -61,85 +283,534 @@ class Package:
         self.status = status # delivery status (ex. at hub OR on route truck 1 OR delivered by truck 1)
         self.deliveryTime = deliveryTime # delivery time of the package which is either the time it was delivered or the string 'N/A'
 
+# columnar package store that keeps every package attribute in its own compact array instead of creating a Package object per package
+# a package is identified by its row, which is the position of its values in every column, and an open addressing hash table maps each package ID to its row
+# repeated strings such as the city, state, zipcode and deadline are interned, so each column only holds a small index into a shared list of strings
+# the status is stored as one of the status codes above along with the truck ID, and the delivery time is stored in seconds (-1 when not delivered yet)
+# display strings are only built by get, printPackage and printAll, which hand back or print a Package object built from the row
+class PackageStore:
+    def __init__(self, addressTable):
+        self.addressTable = addressTable # the address text of a package is looked up from its address index
+        self.strings = list() # interned city, state, zipcode and deadline strings
+        self.stringIndexes = dict() # maps an interned string to its index in self.strings
+        self.index = OpenAddressingPackageHashTable() # maps a package ID to its row
+
+        self.packIDs = array.array('q')
+        self.addressIndexes = array.array('i')
+        self.cities = array.array('i')
+        self.states = array.array('i')
+        self.zipcodes = array.array('i')
+        self.deadlines = array.array('i')
+        self.deadlineSeconds = array.array('i') # deadline as seconds after 8:00:00 so it can be compared to delivery times
+        self.weights = array.array('i')
+        self.statuses = array.array('b')
+        self.truckIDs = array.array('i') # truck the package was loaded on, 0 if it has not been loaded yet
+        self.deliverySeconds = array.array('i')
+
+    # return the index of text in the shared list of strings, adding it the first time it is seen
+    def _intern(self, text):
+        index = self.stringIndexes.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(text)
+            self.stringIndexes[text] = index
+        return index
+
+    # append a package to the end of every column and return its row
+    def _append(self, packID, addressIndex, city, state, zipcode, deadline, weight, status):
+        row = len(self.packIDs)
+        self.packIDs.append(packID)
+        self.addressIndexes.append(addressIndex)
+        self.cities.append(self._intern(city))
+        self.states.append(self._intern(state))
+        self.zipcodes.append(self._intern(zipcode))
+        self.deadlines.append(self._intern(deadline))
+        self.deadlineSeconds.append(convertDeadlineToSeconds(deadline))
+        self.weights.append(weight)
+        self.statuses.append(status)
+        self.truckIDs.append(0)
+        self.deliverySeconds.append(-1)
+        return row
+
+    # write a package over the package already stored in the given row
+    def _overwrite(self, row, packID, addressIndex, city, state, zipcode, deadline, weight, status):
+        self.addressIndexes[row] = addressIndex
+        self.cities[row] = self._intern(city)
+        self.states[row] = self._intern(state)
+        self.zipcodes[row] = self._intern(zipcode)
+        self.deadlines[row] = self._intern(deadline)
+        self.deadlineSeconds[row] = convertDeadlineToSeconds(deadline)
+        self.weights[row] = weight
+        self.statuses[row] = status
+        self.truckIDs[row] = 0
+        self.deliverySeconds[row] = -1
+
+    # add a single package and return its row, a package with a package ID that is already stored replaces that package in its row, the same way the hash tables' add replaces the entry
+    def add(self, packID, addressIndex, city, state, zipcode, deadline, weight, status=AT_HUB):
+        row = self.row(packID)
+        if row is not None:
+            self._overwrite(row, packID, addressIndex, city, state, zipcode, deadline, weight, status)
+            return row
+        row = self._append(packID, addressIndex, city, state, zipcode, deadline, weight, status)
+        self.index.put(packID, row)
+        return row
+
+    # bulk load a batch of packages, each given as a tuple of the arguments to add, so the package ID index only grows once for the batch
+    # like add, a package ID that is already stored or that comes up again in the batch replaces the earlier package in its row
+    def addAll(self, packages):
+        newRows = dict() # maps the package IDs new to the store to the rows appended for them
+        for package in packages:
+            row = newRows.get(package[0])
+            if row is None:
+                row = self.row(package[0])
+            if row is None:
+                newRows[package[0]] = self._append(*package)
+            else:
+                self._overwrite(row, *package)
+        self.index.putAll(list(newRows.items()))
+
+    # return the row of a package, or None if the package is not in the store
+    def row(self, packID):
+        return self.index.get(packID)
+
+    # change the address of the package in the given row, the address text itself comes from the address table
+    def setAddress(self, row, addressIndex, city, state, zipcode):
+        self.addressIndexes[row] = addressIndex
+        self.cities[row] = self._intern(city)
+        self.states[row] = self._intern(state)
+        self.zipcodes[row] = self._intern(zipcode)
+
+    # turn the status code of the package in the given row into the string shown to the user
+    def status(self, row):
+        status = self.statuses[row]
+        if status == AT_HUB:
+            return 'At hub'
+        if status == DELAYED_ON_FLIGHT:
+            return 'Delayed on flight'
+        if status == EN_ROUTE:
+            return f"En Route (Truck {self.truckIDs[row]})"
+        return f"Delivered (Truck {self.truckIDs[row]})"
+
+    # turn the delivery seconds of the package in the given row into the time string shown to the user
+    def deliveryTime(self, row):
+        if self.deliverySeconds[row] < 0:
+            return 'N/A'
+        return convertSecondsToTime(self.deliverySeconds[row])
+
+    # build a Package object holding the display strings of the package in the given row
+    def _package(self, row):
+        strings = self.strings
+        addressIndex = self.addressIndexes[row]
+        return Package(self.packIDs[row], self.addressTable[addressIndex], addressIndex, strings[self.cities[row]], strings[self.states[row]], strings[self.zipcodes[row]],
+                       strings[self.deadlines[row]], self.weights[row], self.status(row), self.deliveryTime(row))
+
+    # return a Package object for the package ID, or None if the package is not in the store, changing the returned object does not change the store
+    def get(self, packID):
+        row = self.row(packID)
+        if row is None:
+            return None
+        return self._package(row)
+
+    # iterate over every package in the same order the package hash table would print them
+    def __iter__(self):
+        for row in self.index:
+            yield self._package(row)
+
+    def __len__(self):
+        return len(self.index)
+
+    # return a store to simulate a day on without changing this one, only the columns a day changes are copied
+    # the address table, the interned strings, the package ID index and the columns that never change are shared, so packages must not be added to the copy,
+    # an address correction may intern a new string into the shared list, which doesn't change what any existing index means
+    def copy(self):
+        store = copy.copy(self)
+        for column in ('addressIndexes', 'cities', 'states', 'zipcodes', 'statuses', 'truckIDs', 'deliverySeconds'):
+            setattr(store, column, getattr(self, column)[:])
+        return store
+
+    def printPackage(self, packID):
+        printPackageInfo(self.get(packID))
+        print()
+
+    def printAll(self):
+        for package in self:
+            printPackageInfo(package)
+        print()
+
+# a truck refuses a load of more than maxPackages packages with a ValueError, whether the load comes from the hand-typed load plan or from the load planner
 class Truck:
-    def __init__(self, truID, departureSeconds, userSeconds, packsID, packageTable):
+    def __init__(self, truID, departureSeconds, userSeconds, packsID, packageTable, eventLog=None, verbose=True, maxPackages=TRUCK_MAX_PACKAGES):
+        if len(packsID) > maxPackages:
+            raise ValueError(f"truck {truID} is loaded with {len(packsID)} packages but can only hold {maxPackages}")
         self.currentAddress = 0 # index to find the address in the addressTable and is where the truck is currently located
-        self.maxPackages = 16 # maximum amount of packages a truck can hold at once
+        self.maxPackages = maxPackages # maximum amount of packages a truck can hold at once
         self.mileage = 0 # how many miles the truck has traveled so far
         self.elapsedSeconds = 0 # how much time has passed from the truck's point of view (number goes from 0 to 32400 which corresponds to 8:00:00-17:00:00)
         self.recallTime = 'N/A' # what time the truck returned to the hub if available
+        self.departed = False # whether the truck has left the hub
+        self.edits = list() # package IDs on this truck whose address was corrected
+        self.delivered = 0 # number of packages this truck has delivered so far
+        self.route = None # planned order of addresses set by improveRoute, None means the truck always drives to the nearest address
+        self.routeIndex = 0 # position in the planned route of the next address to visit
+        self.unplannedStops = list() # addresses an address correction added after the route was planned, nextStop fits them into the route
+        self.counters = None # hot path counters of nextStop and arrive, None unless enableCounters was called so the normal run doesn't pay for counting
 
         self.truID = truID # the id of the truck
         self.departureSeconds = departureSeconds # the time at which the truck starts delivering packages (number goes from 0 to 32400 which corresponds to 8:00:00-17:00:00)
         self.departureTime = convertSecondsToTime(departureSeconds) # the time at which the truck starts delivering packages in a time string format 'HH:MM:SS'
         self.userSeconds = userSeconds # the deadline in seconds at which the truck has to stop (number goes from 0 to 32400 which corresponds to 8:00:00-17:00:00) which allows the user to see how far the simulation has run up to a certain point in time
+        self.eventLog = eventLog # optional list that departures, deliveries and returns are appended to so a DeliveryTimeline can be built from a single full day run
+        self.verbose = verbose # whether the truck prints its departure and return messages
 
+        self.packageTable = packageTable # the package store the cargo rows belong to
         self.cargo = list() 
-        for packID in packsID: # pass in a list of package IDs for the truck, and for every ID number, find the corresponding package in the hash table and append it to the cargo list
-            self.cargo.append(packageTable.get(packID))
+        for packID in packsID: # pass in a list of package IDs for the truck, and for every ID number, find the row of the corresponding package in the package store and append it to the cargo list
+            self.cargo.append(packageTable.row(packID))
 
         self.addresses = set()
-        for package in self.cargo: # iterate over all the packages loaded onto the truck and use a set to keep track of which addresses the truck has to visit in order to prevent duplicate addresses from populating the data structure
-            self.addresses.add(package.addressIndex)
+        for row in self.cargo: # iterate over all the packages loaded onto the truck and use a set to keep track of which addresses the truck has to visit in order to prevent duplicate addresses from populating the data structure
+            self.addresses.add(packageTable.addressIndexes[row])
 
-    def deliver(self, distanceTable):
+    # the truck leaves the hub, so every package loaded onto it is now en route
+    def depart(self):
         self.elapsedSeconds = self.departureSeconds # doing this moves time forward for the truck so that it can leave at the earliest time it is allowed
-        if self.elapsedSeconds < self.userSeconds: # if there is still time for the truck to perform actions then continue otherwise stop
+        self.departed = True
+        if self.verbose:
             print(f"Truck {self.truID} departed at {self.departureTime}") # example: if truck can leave at 8:00:00 and user gives time 8:00:01 then at 8:00:01 the truck is traveling to the next (COMMENT CONTINUED DOWN BELOW)
             # location so the packages loaded onto it are in transit and the truck has left otherwise if truck can leave at 8:00:00 and user gives time 8:00:00 then all the packages on this truck are still in hub and the truck hasn't left yet
             print()
-            for package in self.cargo: # iterate over every package on the truck and update its status to be en route if there is time to perform actions
-                package.status = f"En Route (Truck {self.truID})"
+        if self.eventLog is not None: # the departure is only visible to a user time strictly after the departure time, so it is logged one second later
+            self.eventLog.append((self.departureSeconds + 1, 'depart', self.truID, tuple(self.packageTable.packIDs[row] for row in self.cargo), self.departureTime))
+        for row in self.cargo: # iterate over every package on the truck and update its status to be en route
+            self.packageTable.statuses[row] = EN_ROUTE
+            self.packageTable.truckIDs[row] = self.truID
+
+    # plan the order of the truck's stops before it departs by improving the nearest neighbor order with 2-opt and Or-opt moves, see improveStopOrder
+    # the truck then follows the planned route through the usual nextStop and arrive bookkeeping, and returns the miles of the nearest neighbor route and of the improved route
+    # timeBudget covers building the nearest neighbor order as well, which takes O(n^2) on its own, and if it runs out before that order is complete
+    # the truck is left without a planned route, so it drives the same nearest neighbor order stop by stop, and None is returned
+    def improveRoute(self, distanceTable, timeBudget=0.05, neighborCount=8):
+        deadline = time.perf_counter() + timeBudget
+        stopDeadlines = dict()
+        for row in self.cargo:
+            addressIndex = self.packageTable.addressIndexes[row]
+            stopDeadlines[addressIndex] = min(stopDeadlines.get(addressIndex, END_OF_DAY_SECONDS), self.packageTable.deadlineSeconds[row])
+        route = list()
+        remaining = set(self.addresses)
+        currentAddress = self.currentAddress
+        nearestNeighborMiles = 0
+        while remaining: # start from the order the truck would drive anyway
+            if time.perf_counter() >= deadline:
+                return None
+            distanceRow = distanceTable.row(currentAddress)
+            nextAddress = min(remaining, key=distanceRow.__getitem__)
+            nearestNeighborMiles += distanceRow[nextAddress]
+            remaining.remove(nextAddress)
+            route.append(nextAddress)
+            currentAddress = nextAddress
+        nearestNeighborMiles += distanceTable.distance(currentAddress, 0)
+        self.route = improveStopOrder(route, self.currentAddress, distanceTable, self.departureSeconds, stopDeadlines, deadline, neighborCount)
+        self.routeIndex = 0
+        return nearestNeighborMiles, routeMiles(self.route, self.currentAddress, distanceTable)
+
+    # start counting where the truck spends its time: the candidate stops nextStop scanned, the distance and travel seconds lookups it made,
+    # the best stop changes (how often the closest stop found so far changed during a scan), the stops arrive made, and the seconds spent in deliver
+    # every distance table answers a lookup in either order of its indexes, so the truck never flips them into the lower triangle the csv file stores, and there are no index flips left to count
+    # the fleet engine drives the trucks through nextStop and arrive without deliver, so it times its own run instead, see FleetEngine.counterReport
+    def enableCounters(self):
+        self.counters = {'candidateStops': 0, 'distanceLookups': 0, 'bestStopChanges': 0, 'stops': 0, 'seconds': 0.0}
+
+    # return the counters along with the stops per second deliver made, or None if counting is not enabled
+    def counterReport(self):
+        if self.counters is None:
+            return None
+        return dict(self.counters, stopsPerSecond=self.counters['stops'] / self.counters['seconds'] if self.counters['seconds'] > 0 else 0.0)
+
+    # find the next address the truck must go to and return its index along with the distance and travel seconds to get there
+    # that is the next address of the planned route if there is one, otherwise or once the planned route is used up, the closest unvisited address
+    def nextStop(self, distanceTable):
+        if self.route is not None:
+            while self.unplannedStops: # put every address added by a correction where it adds the fewest miles to the rest of the route
+                addressIndex = self.unplannedStops.pop()
+                if addressIndex in self.route[self.routeIndex:]:
+                    continue
+                previousStops = [self.currentAddress] + self.route[self.routeIndex:]
+                nextStops = self.route[self.routeIndex:] + [0]
+                insertAt = min(range(len(nextStops)), key=lambda i: distanceTable.distance(previousStops[i], addressIndex) + distanceTable.distance(addressIndex, nextStops[i]) - distanceTable.distance(previousStops[i], nextStops[i]))
+                self.route.insert(self.routeIndex + insertAt, addressIndex)
+            while self.routeIndex < len(self.route) and self.route[self.routeIndex] not in self.addresses: # skip addresses an address correction took off the truck's list
+                self.routeIndex += 1
+            if self.routeIndex < len(self.route):
+                nextAddress = self.route[self.routeIndex]
+                if self.counters is not None:
+                    self.counters['candidateStops'] += 1
+                    self.counters['distanceLookups'] += 2
+                return nextAddress, distanceTable.distance(self.currentAddress, nextAddress), distanceTable.travelSeconds(self.currentAddress, nextAddress)
+        distanceRow = distanceTable.row(self.currentAddress) # the distance table is symmetric, so this row holds the distance from the current location to every address
+        if self.counters is not None:
+            return self.countedNextStop(distanceRow, distanceTable)
+        minDeliveryIndex = min(self.addresses, key=distanceRow.__getitem__) # ties go to the first address in the set just like a strict less than comparison would
+        return minDeliveryIndex, distanceRow[minDeliveryIndex], distanceTable.travelSeconds(self.currentAddress, minDeliveryIndex)
+
+    # the same scan for the closest address as nextStop, written out as a loop so every candidate, lookup and best stop change can be counted
+    def countedNextStop(self, distanceRow, distanceTable):
+        counters = self.counters
+        minDeliveryIndex = None
+        minDeliveryDistance = math.inf
+        for addressIndex in self.addresses:
+            distance = distanceRow[addressIndex]
+            if distance < minDeliveryDistance:
+                minDeliveryIndex, minDeliveryDistance = addressIndex, distance
+                counters['bestStopChanges'] += 1
+        counters['candidateStops'] += len(self.addresses)
+        counters['distanceLookups'] += len(self.addresses) + 1 # every candidate's distance plus the travel seconds to the closest one
+        return minDeliveryIndex, minDeliveryDistance, distanceTable.travelSeconds(self.currentAddress, minDeliveryIndex)
+
+    # drive to the address found by nextStop and deliver every package on the truck that goes to that address
+    def arrive(self, minDeliveryIndex, minDeliveryDistance, minDeliverySeconds):
+        addressIndexes = self.packageTable.addressIndexes
+        statuses = self.packageTable.statuses
+        deliverySeconds = self.packageTable.deliverySeconds
+        self.mileage = round(self.mileage + minDeliveryDistance, 1) # we have now visited the new address, so add the distance traveeled to the truck's total mileage
+        self.elapsedSeconds += minDeliverySeconds # add the time we have spent traveling to the new location in order to show that time has passed for the truck
+        self.currentAddress = minDeliveryIndex # change the currentAddress property to represent the new location that we are now at
+        if self.counters is not None:
+            self.counters['stops'] += 1
+        remainingCargo = list()
+        for row in self.cargo: # now that we are at the new location, its time to deliver the packages so loop over all the packages that the truck is carrying and deliver the ones that have a matching address to the current location of the truck
+            if addressIndexes[row] == self.currentAddress:
+                statuses[row] = DELIVERED # when a package has been delivered, it's status needs to be altered to say delivered, the truck that delivered it was already recorded when it departed
+                deliverySeconds[row] = self.elapsedSeconds # record the time at which the package was delivered
+                self.delivered += 1
+                if self.eventLog is not None:
+                    self.eventLog.append((self.elapsedSeconds, 'deliver', self.truID, self.packageTable.packIDs[row], (self.elapsedSeconds, self.mileage)))
+            else:
+                remainingCargo.append(row)
+        self.cargo = remainingCargo # only the packages that were not delivered stay in the truck's cargo list
+        self.addresses.discard(self.currentAddress) # remove the current address from the truck's list of unvisited addresses, an address correction made on the way may have removed it already
+
+    # run this truck on its own from its departure until it runs out of packages or out of time, the fleet engine uses the same steps to run many trucks on one clock
+    def deliver(self, distanceTable):
+        startTime = time.perf_counter() if self.counters is not None else None
+        self.elapsedSeconds = self.departureSeconds
+        if self.elapsedSeconds < self.userSeconds: # if there is still time for the truck to perform actions then continue otherwise stop
+            self.depart()
         while self.elapsedSeconds < self.userSeconds and len(self.cargo) > 0: # while there is still time remaining to possibly go to the nearest location and the truck still has packages to deliver
-            minDeliveryDistance = float('inf')
-            minDeliveryIndex = float('inf')
-            for possibleDeliveryIndex in self.addresses: # iterate over all the unvisited addresses the truck must go to in order to find the closest address possible to visit
-                if distanceTable[self.currentAddress][possibleDeliveryIndex] is not None: # if a distance number exists for this index combination then set possibleDeliveryDistance to be this number to signify this is the distance to an address the truck can possibly visit
-                    possibleDeliveryDistance = distanceTable[self.currentAddress][possibleDeliveryIndex]
-                else: # otherwise if the distance number does not exist for these two index combination simply flip the numbers to get the distance since distance x to y is the same as distance y to x and the table only stores the value once
-                    possibleDeliveryDistance = distanceTable[possibleDeliveryIndex][self.currentAddress]
-                if possibleDeliveryDistance < minDeliveryDistance:  # if the proposed address is closer than the current lowest address recorded, visit this location instead
-                    minDeliveryIndex = possibleDeliveryIndex
-                    minDeliveryDistance = possibleDeliveryDistance
-            if self.elapsedSeconds + math.ceil(minDeliveryDistance / 0.005) > self.userSeconds: # even though the closest address to visit was found above, do we even have enough time to visit it? if not, break out of the entire loop
+            minDeliveryIndex, minDeliveryDistance, minDeliverySeconds = self.nextStop(distanceTable)
+            if self.elapsedSeconds + minDeliverySeconds > self.userSeconds: # even though the closest address to visit was found above, do we even have enough time to visit it? if not, break out of the entire loop
                 break
-            self.mileage = round(self.mileage + minDeliveryDistance, 1) # we have now visited the new address, so add the distance traveeled to the truck's total mileage
-            self.elapsedSeconds += math.ceil(minDeliveryDistance / 0.005) # add the time we have spent traveling to the new location in order to show that time has passed for the truck
-            self.currentAddress = minDeliveryIndex # change the currentAddress property to represent the new location that we are now at
-            for package in self.cargo[:]: # now that we are at the new location, its time to deliver the packages so loop over all the packages that the truck is carrying and deliver the ones that have a matching address to the current location of the truck
-                if package.addressIndex == self.currentAddress:
-                    package.status = f"Delivered (Truck {self.truID})" # when a package has been delivered, it's status needs to be altered to say delivered by which truck
-                    package.deliveryTime = convertSecondsToTime( # record the time at which the package was delivered
-                        self.elapsedSeconds)
-                    self.cargo.remove(package) # remove the delivered package from the truck's cargo list
-            self.addresses.remove(self.currentAddress) # remove the current address from the truck's list of unvisited addresses
+            self.arrive(minDeliveryIndex, minDeliveryDistance, minDeliverySeconds)
+        if startTime is not None:
+            self.counters['seconds'] += time.perf_counter() - startTime
 
     def recall(self, distanceTable):
         if len(self.cargo) == 0 and len(self.addresses) == 0: # only recall a truck if it actually finished all of its deliveries
+            lastDeliverySeconds = self.elapsedSeconds # the return is reported as soon as the last package is dropped off, so that is when it becomes visible in the timeline
             self.mileage = round( # add the distance the truck has traveled to return to the hub from its current location
-                self.mileage + distanceTable[self.currentAddress][0], 1)
-            self.elapsedSeconds += math.ceil( # add the time truck has taken to return back to the hub
-                distanceTable[self.currentAddress][0] / 0.005)
+                self.mileage + distanceTable.distance(self.currentAddress, 0), 1)
+            self.elapsedSeconds += distanceTable.travelSeconds(self.currentAddress, 0) # add the time truck has taken to return back to the hub
             self.currentAddress = 0 # change the current address of the truck to be at the hub
             self.recallTime = convertSecondsToTime(self.elapsedSeconds) # note the time the truck returned to the hub as a time string in the format 'HH:MM:SS'
-            print(f"Truck {self.truID} returned at {self.recallTime}")
-            print()
+            if self.verbose:
+                print(f"Truck {self.truID} returned at {self.recallTime}")
+                print()
+            if self.eventLog is not None:
+                self.eventLog.append((lastDeliverySeconds, 'return', self.truID, None, (self.recallTime, self.mileage)))
+
+
+# miles driven from start through every address of the route and back to the hub
+def routeMiles(route, start, distanceTable):
+    miles = 0
+    currentAddress = start
+    for addressIndex in route + [0]:
+        miles += distanceTable.distance(currentAddress, addressIndex)
+        currentAddress = addressIndex
+    return miles
+
+# local search that shortens a route with 2-opt moves (reverse a stretch of the route) and Or-opt moves (move a run of 1 to 3 stops somewhere else)
+# the route is treated as the closed tour start, route..., hub, and each move is only tried between a stop and its neighborCount closest stops on the route
+# a stop that is the start or the hub itself is delivered where the truck already is, so it is kept at the front or the back of the route and left out of the search, and so is a repeated stop
+# the change in miles of a move only depends on the few edges it removes and adds, so every candidate move is evaluated in O(1) and only moves that shorten the tour are applied
+# the closest stops of a stop are only looked up the first time the search reaches it, which costs one O(n) pass over the route, so a short budget on a long route isn't spent on stops it never gets to
+# an applied move only rewrites the stretch of the tour between the stops it touches, and an improving move is only kept if it doesn't make more stops late than before,
+# which is checked by timing the tour again from the first stop the move changed, the stops before it arrive at the same time as before
+# the search stops once no move improves the tour or once time.perf_counter() reaches deadline, the clock is checked before every stop the search looks at, and returns the improved route without the start and the hub
+def improveStopOrder(route, start, distanceTable, departureSeconds, stopDeadlines, deadline, neighborCount):
+    distance = distanceTable.distance
+    stops = [addressIndex for addressIndex in dict.fromkeys(route) if addressIndex != start and addressIndex != 0]
+    startStops = [start] if start in route else []
+    hubStops = [0] if 0 in route and start != 0 else []
+    if len(stops) < 3:
+        return startStops + stops + hubStops
+    tour = [start] + stops + [0]
+    positions = {addressIndex: position for position, addressIndex in enumerate(tour[:-1])}
+    neighbors = dict()
+
+    checkDeadlines = any(stopDeadlines.get(addressIndex, END_OF_DAY_SECONDS) < END_OF_DAY_SECONDS for addressIndex in stops)
+    arrivalSeconds = [departureSeconds] # seconds at which the truck reaches every position of the tour, only kept when there are deadlines to check
+    if checkDeadlines:
+        for position in range(1, len(tour)):
+            arrivalSeconds.append(arrivalSeconds[-1] + distanceTable.travelSeconds(tour[position - 1], tour[position]))
+
+    # the neighborCount stops of the route closest to the given stop
+    def closeStops(addressIndex):
+        closest = neighbors.get(addressIndex)
+        if closest is None:
+            distanceRow = distanceTable.row(addressIndex)
+            closest = neighbors[addressIndex] = heapq.nsmallest(neighborCount, (other for other in stops if other != addressIndex), key=distanceRow.__getitem__)
+        return closest
+
+    # number of stops from the given position on that are reached after their deadline at the given arrival seconds
+    def lateStopsFrom(first, arrivals):
+        return sum(1 for position in range(first, len(tour) - 1) if arrivals[position - first] > stopDeadlines.get(tour[position], END_OF_DAY_SECONDS))
+
+    # replace the stretch of the tour starting at position first with the same stops in a new order if it doesn't make more stops late, and return whether it was replaced
+    def replaceStretch(first, stretch):
+        last = first + len(stretch)
+        if checkDeadlines:
+            lateBefore = lateStopsFrom(first, arrivalSeconds[first:])
+            oldStretch = tour[first:last]
+            tour[first:last] = stretch
+            arrivals = list()
+            elapsedSeconds = arrivalSeconds[first - 1]
+            for position in range(first, len(tour)):
+                elapsedSeconds += distanceTable.travelSeconds(tour[position - 1], tour[position])
+                arrivals.append(elapsedSeconds)
+            if lateStopsFrom(first, arrivals) > lateBefore:
+                tour[first:last] = oldStretch
+                return False
+            arrivalSeconds[first:] = arrivals
+        else:
+            tour[first:last] = stretch
+        for position in range(first, last):
+            positions[tour[position]] = position
+        return True
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+
+        # 2-opt, connect a stop to one of its close neighbors by reversing the stretch of the tour between them
+        for addressIndex in stops:
+            if time.perf_counter() >= deadline:
+                break
+            for neighbor in closeStops(addressIndex):
+                i, j = sorted((positions[addressIndex], positions[neighbor]))
+                if j - i < 2:
+                    continue
+                a, b, c, d = tour[i], tour[i + 1], tour[j], tour[j + 1]
+                delta = distance(a, c) + distance(b, d) - distance(a, b) - distance(c, d)
+                if delta < -1e-9 and replaceStretch(i + 1, tour[j:i:-1]):
+                    improved = True
+
+        # Or-opt, take a run of 1 to 3 stops out of the tour and put it back right after one of the first stop's close neighbors, in either direction
+        for segmentLength in (1, 2, 3):
+            for i in range(1, len(tour) - segmentLength):
+                if time.perf_counter() >= deadline:
+                    break
+                segment = tour[i:i + segmentLength]
+                previous, following = tour[i - 1], tour[i + segmentLength]
+                removeDelta = distance(previous, following) - distance(previous, segment[0]) - distance(segment[-1], following)
+                for neighbor in closeStops(segment[0]):
+                    p = positions[neighbor]
+                    if i - 1 <= p < i + segmentLength: # the neighbor has to be outside the run and not right before it
+                        continue
+                    x, y = tour[p], tour[p + 1]
+                    forwardDelta = distance(x, segment[0]) + distance(segment[-1], y) - distance(x, y)
+                    reverseDelta = distance(x, segment[-1]) + distance(segment[0], y) - distance(x, y)
+                    insertSegment = segment if forwardDelta <= reverseDelta else segment[::-1]
+                    if removeDelta + min(forwardDelta, reverseDelta) < -1e-9:
+                        if p < i: # the run moves back, so the stops from after the neighbor up to the run shift one run length forward
+                            moved = replaceStretch(p + 1, insertSegment + tour[p + 1:i])
+                        else: # the run moves forward, so the stops after it up to the neighbor shift one run length back
+                            moved = replaceStretch(i, tour[i + segmentLength:p + 1] + insertSegment)
+                        if moved:
+                            improved = True
+                            break
+    return startStops + tour[1:-1] + hubStops
 
+# list of addresses that also keeps a hash index from every address to its position, so looking up the index of an address is O(1) instead of a linear scan of the list
+# the index is built once when the table is created, so the table is meant to be filled in one go by loadAddressData
+class AddressTable(list):
+    def __init__(self, addresses=()):
+        super().__init__(addresses)
+        self.indexes = dict()
+        for index, address in enumerate(self):
+            self.indexes.setdefault(address, index) # keep the first position just like list.index would
 
-def loadAddressData(): # load the address table with data read from the addressCSV file
-    addressTable = list()
-    with open('csv/addressCSV.csv', mode='r', encoding='utf-8-sig') as file:
+    def index(self, address):
+        index = self.indexes.get(address)
+        if index is None:
+            raise ValueError(f"{address!r} is not in the address table")
+        return index
+
+
+def loadAddressData(fileName='csv/addressCSV.csv'): # load the address table with data read from the addressCSV file
+    addresses = list()
+    with open(fileName, mode='r', encoding='utf-8-sig') as file:
         addressReader = csv.reader(file)
         for row in addressReader:
-            addressTable.append(row[0])
-    return addressTable
+            addresses.append(row[0])
+    return AddressTable(addresses)
+
+
+# the binary cache of the distance table starts with a header holding a magic string, the number of addresses, and the modification time and size of the csv file it was parsed from
+# the header is followed by the dense matrix as 8 byte floats in row order
+DISTANCE_CACHE_MAGIC = b'LQDIST01'
+DISTANCE_CACHE_HEADER = struct.Struct('<8sqqq')
+
+# the most addresses loadDistanceData keeps in a dense table, 10,000 addresses already take 800 MB as 8 byte floats
+DENSE_DISTANCE_LIMIT = 10000
+
+# memory map the cached distance table for the csv file and return it as a mapped distance table, or None if there is no cache or the csv file has changed since the cache was written
+def loadDistanceCache(cacheFileName, addressTableLength, fileStat):
+    try:
+        with open(cacheFileName, mode='rb') as file:
+            header = file.read(DISTANCE_CACHE_HEADER.size)
+            if len(header) != DISTANCE_CACHE_HEADER.size or DISTANCE_CACHE_HEADER.unpack(header) != (DISTANCE_CACHE_MAGIC, addressTableLength, fileStat.st_mtime_ns, fileStat.st_size):
+                return None
+            if os.fstat(file.fileno()).st_size != DISTANCE_CACHE_HEADER.size + 8 * addressTableLength * addressTableLength:
+                return None
+            if addressTableLength == 0:
+                return DenseDistanceTable(list())
+            cache = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) # the mapping stays valid after the file is closed
+    except OSError:
+        return None
+    return MappedDistanceTable(memoryview(cache)[DISTANCE_CACHE_HEADER.size:].cast('d'), addressTableLength)
+
+# write the rows of the dense distance table to the binary cache, writing to a temporary file first so a half written cache is never picked up
+# failing to write the cache, for example because the csv folder is read only, just means the next start parses the csv file again
+def saveDistanceCache(cacheFileName, distanceRows, fileStat):
+    temporaryFileName = f"{cacheFileName}.{os.getpid()}.tmp"
+    try:
+        with open(temporaryFileName, mode='wb') as file:
+            file.write(DISTANCE_CACHE_HEADER.pack(DISTANCE_CACHE_MAGIC, len(distanceRows), fileStat.st_mtime_ns, fileStat.st_size))
+            for row in distanceRows:
+                file.write(array.array('d', row).tobytes())
+        os.replace(temporaryFileName, cacheFileName)
+    except OSError:
+        if os.path.exists(temporaryFileName):
+            os.remove(temporaryFileName)
 
 
-def loadDistanceData(addressTableLength): # load the distance table which is a two-dimensional list with data read from the distanceCSV file
+# the csv only stores each distance once in its lower triangle, so after reading it the missing half is filled in by flipping the indices since distance x to y is the same as distance y to x
+# this leaves a dense, symmetric matrix so a truck can read a whole row of distances from its current location without checking for missing values
+# parsing the csv is slow for large address sets, so the parsed matrix is saved to a binary cache file next to the csv file and later runs memory map that cache instead, as long as the csv file has the same modification time and size
+# above maxDenseAddresses addresses the dense table would not fit in memory, so a tiled distance table that loads parts of the table on demand is returned instead, see TiledDistanceTable
+def loadDistanceData(addressTableLength, fileName='csv/distanceCSV.csv', useCache=True, maxDenseAddresses=DENSE_DISTANCE_LIMIT): # load the distance table with data read from the distanceCSV file
+    if addressTableLength > maxDenseAddresses:
+        return loadTiledDistanceData(addressTableLength, fileName)
+    cacheFileName = os.path.splitext(fileName)[0] + '.cache'
+    fileStat = os.stat(fileName)
+    if useCache:
+        distanceTable = loadDistanceCache(cacheFileName, addressTableLength, fileStat)
+        if distanceTable is not None:
+            return distanceTable
+
     distanceTable = list()
     for i in range(addressTableLength):
         distanceTable.append([None] * addressTableLength)
-    with open('csv/distanceCSV.csv', mode='r', encoding='utf-8-sig') as file:
+    with open(fileName, mode='r', encoding='utf-8-sig') as file:
         distanceReader = csv.reader(file)
         rowIndex = 0
         for row in distanceReader:
@@ -149,24 +820,295 @@ def loadDistanceData(addressTableLength): # load the distance table which is a t
                     distanceTable[rowIndex][columnIndex] = float(column)
                 columnIndex += 1
             rowIndex += 1
-    return distanceTable
+    for rowIndex in range(addressTableLength):
+        row = distanceTable[rowIndex]
+        for columnIndex in range(addressTableLength):
+            if row[columnIndex] is None:
+                row[columnIndex] = distanceTable[columnIndex][rowIndex]
+    if useCache:
+        saveDistanceCache(cacheFileName, distanceTable, fileStat)
+    return DenseDistanceTable(distanceTable)
+
+# every part of the program reads distances through a distance table, which is any object with these methods:
+# distance(i, j) returns the miles from address index i to address index j, row(i) returns the distances from address i to every address as a sequence indexed by address index,
+# travelSeconds(i, j) returns the whole seconds a truck needs to drive from i to j, len(table) is the number of addresses and close() releases whatever the table holds open
+# trucks travel at 18 miles per hour which is 0.005 miles per second, so the whole seconds it takes to travel between two addresses is ceil(distance / 0.005)
+# a lookup of a single distance goes through distance, and row is only used by a scan that compares many distances from the same address, such as finding the nearest stop, so the row is looked up once per scan
+# the dense table below keeps the parsed csv file as a list of rows, the mapped table reads the memory mapped distance cache or the shared memory of a scenario sweep, and the tiled table loads tiles on demand
+# the dense table already holds every distance in memory, so it computes every travel seconds once up front as well
+class DenseDistanceTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.travelRows = [[math.ceil(distance / 0.005) for distance in row] for row in rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def distance(self, rowIndex, columnIndex):
+        return self.rows[rowIndex][columnIndex]
+
+    def row(self, rowIndex):
+        return self.rows[rowIndex]
+
+    def travelSeconds(self, rowIndex, columnIndex):
+        return self.travelRows[rowIndex][columnIndex]
+
+    def close(self): # the rows are plain lists, so there is nothing to release
+        pass
+
+# distance table over one flat buffer of 8 byte floats in row order, such as the memory mapped distance cache or the shared memory of a scenario sweep
+# the buffer is mapped so the table doesn't have to be held in memory, so the travel seconds are computed on every lookup instead of being kept next to it
+class MappedDistanceTable:
+    def __init__(self, distances, addressCount):
+        self.distances = distances
+        self.addressCount = addressCount
+
+    def __len__(self):
+        return self.addressCount
+
+    # both indexes are checked, since a column past the end of its row would quietly read the next row and a negative index the end of the buffer
+    def distance(self, rowIndex, columnIndex):
+        if not (0 <= rowIndex < self.addressCount and 0 <= columnIndex < self.addressCount):
+            raise IndexError('distance table index out of range')
+        return self.distances[rowIndex * self.addressCount + columnIndex]
+
+    def row(self, rowIndex):
+        if not 0 <= rowIndex < self.addressCount:
+            raise IndexError('distance table row out of range')
+        return self.distances[rowIndex * self.addressCount:(rowIndex + 1) * self.addressCount] # a slice of a memoryview shares the buffer and copies nothing
+
+    def travelSeconds(self, rowIndex, columnIndex):
+        return math.ceil(self.distance(rowIndex, columnIndex) / 0.005)
+
+    def close(self): # the mapping is released together with the buffer once the last row handed out is gone
+        pass
+
+
+# the tiled distance table splits the symmetric matrix into square tiles of tileSize by tileSize distances and only keeps the cacheTiles most recently used tiles in memory,
+# so memory is bounded by the cache size instead of growing with the square of the number of addresses, and a truck that only looks up distances among its own stops only loads the tiles around them
+# tiles come from loadTile, which is called with the tile row and tile column and returns the tile as an array of tileSize * tileSize floats in row order, and whose close method is called by close,
+# and only tiles on or below the diagonal are ever loaded because distance(i, j) looks up distance(j, i) when j > i
+class TiledDistanceTable:
+    def __init__(self, addressCount, tileSize, loadTile, cacheTiles=64):
+        self.addressCount = addressCount
+        self.tileSize = tileSize
+        self.loadTile = loadTile
+        self.cacheTiles = cacheTiles
+        self.tiles = OrderedDict() # maps (tile row, tile column) to the tile, in least recently used order
+        self.hits = 0 # lookups answered from a cached tile
+        self.misses = 0 # lookups that had to load their tile
+        self.evictions = 0 # tiles dropped from the cache to make room for another one
+
+    def __len__(self):
+        return self.addressCount
+
+    # a whole row would load every tile in the row, so the row only looks up each distance through the tile cache when it is read
+    def row(self, rowIndex):
+        if not 0 <= rowIndex < self.addressCount:
+            raise IndexError('distance table row out of range')
+        return TiledDistanceRow(self, rowIndex)
+
+    def distance(self, rowIndex, columnIndex):
+        if rowIndex < columnIndex:
+            rowIndex, columnIndex = columnIndex, rowIndex
+        tileSize = self.tileSize
+        key = (rowIndex // tileSize, columnIndex // tileSize)
+        tile = self.tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            tile = self.loadTile(*key)
+            self.tiles[key] = tile
+            if len(self.tiles) > self.cacheTiles:
+                self.tiles.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.hits += 1
+            self.tiles.move_to_end(key)
+        return tile[(rowIndex % tileSize) * tileSize + columnIndex % tileSize]
+
+    # tiles only hold distances, so the travel seconds are computed from the distance on every lookup
+    def travelSeconds(self, rowIndex, columnIndex):
+        return math.ceil(self.distance(rowIndex, columnIndex) / 0.005)
+
+    # return the hit and miss statistics of the tile cache and how many bytes the cached tiles take
+    def cacheStats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'hitRate': self.hits / lookups if lookups else 0.0,
+                'cachedTiles': len(self.tiles), 'cacheBytes': 8 * self.tileSize * self.tileSize * len(self.tiles)}
 
+    def close(self):
+        self.tiles.clear()
+        self.loadTile.close()
 
-def loadPackageData(addressTable, userSeconds): # load the package hash table with data read from the packageCSV file
-    packageTable = PackageHashTable()
-    with open('csv/packageCSV.csv', mode='r', encoding='utf-8-sig') as file:
+    # the tile cache is left behind when the table is copied to another process, which starts with an empty cache
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['tiles'] = OrderedDict()
+        return state
+
+# the distances from one address of a tiled distance table, handed out once per scan by TiledDistanceTable.row
+class TiledDistanceRow:
+    __slots__ = ('table', 'rowIndex')
+
+    def __init__(self, table, rowIndex):
+        self.table = table
+        self.rowIndex = rowIndex
+
+    def __getitem__(self, columnIndex):
+        return self.table.distance(self.rowIndex, columnIndex)
+
+    def __len__(self):
+        return self.table.addressCount
+
+# the tile file of a distance csv file starts with a header holding a magic string, the number of addresses, the tile size, and the modification time and size of the csv file it was built from
+# the header is followed by every tile on or below the diagonal as tileSize * tileSize 8 byte floats, tile row by tile row, so tile (r, c) is tile number r * (r + 1) / 2 + c
+DISTANCE_TILES_MAGIC = b'LQTILE01'
+DISTANCE_TILES_HEADER = struct.Struct('<8sqqqq')
+
+# loads tiles of a tiled distance table from a tile file, the file is opened on the first tile that is loaded and stays open until close is called
+# a forked worker process opens the file again, because a file inherited from the parent shares its read position with the parent and every other worker
+class DistanceTileFile:
+    def __init__(self, fileName, tileSize):
+        self.fileName = fileName
+        self.tileSize = tileSize
+        self.file = None
+        self.processID = None # ID of the process that opened the file
+
+    def __call__(self, tileRow, tileColumn):
+        if self.file is None or self.processID != os.getpid():
+            self.close() # closing the inherited copy in a forked worker leaves the parent's file open
+            self.file = open(self.fileName, mode='rb')
+            self.processID = os.getpid()
+        tileBytes = 8 * self.tileSize * self.tileSize
+        self.file.seek(DISTANCE_TILES_HEADER.size + (tileRow * (tileRow + 1) // 2 + tileColumn) * tileBytes)
+        tile = array.array('d')
+        tile.frombytes(self.file.read(tileBytes))
+        if len(tile) != self.tileSize * self.tileSize:
+            raise ValueError(f"{self.fileName} is shorter than its header says")
+        return tile
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    # an open file can't be copied to another process, which opens the file again itself
+    def __getstate__(self):
+        return {'fileName': self.fileName, 'tileSize': self.tileSize, 'file': None, 'processID': None}
+
+# computes tiles of a tiled distance table from the (x, y) coordinates in miles of every address, as straight line miles rounded to a tenth with round, the same way generateData writes the distance csv file
+# a miss computes a whole tile for the one distance that was looked up, so with addresses in no particular order a small tile size such as 8 works best for this source
+class CoordinateDistanceTiles:
+    def __init__(self, points, tileSize):
+        self.points = points
+        self.tileSize = tileSize
+
+    def __call__(self, tileRow, tileColumn):
+        tileSize = self.tileSize
+        tile = array.array('d')
+        columnPoints = self.points[tileColumn * tileSize:(tileColumn + 1) * tileSize]
+        padding = [0.0] * (tileSize - len(columnPoints)) # the last tile column is cut short by the number of addresses, but every tile row still takes tileSize places
+        for startX, startY in self.points[tileRow * tileSize:(tileRow + 1) * tileSize]:
+            tile.extend([round(math.hypot(startX - endX, startY - endY), 1) for endX, endY in columnPoints])
+            tile.extend(padding)
+        return tile
+
+    def close(self): # the tiles are computed, so there is nothing to release
+        pass
+
+# build the tile file from the lower triangle of the distance csv file, writing to a temporary file first so a half written tile file is never picked up
+# the csv file is read one band of tileSize rows at a time, and the band is written out as soon as it is complete, so building holds tileSize rows of distances in memory and never the whole table
+def saveDistanceTiles(fileName, tilesFileName, addressTableLength, tileSize, fileStat):
+    tileBytes = bytes(8 * tileSize * tileSize)
+    temporaryFileName = f"{tilesFileName}.{os.getpid()}.tmp"
+    try:
+        with open(fileName, mode='r', encoding='utf-8-sig') as file, open(temporaryFileName, mode='wb') as tilesFile:
+            tilesFile.write(DISTANCE_TILES_HEADER.pack(DISTANCE_TILES_MAGIC, addressTableLength, tileSize, fileStat.st_mtime_ns, fileStat.st_size))
+            distanceReader = csv.reader(file)
+            band = list()
+            for rowIndex in range(addressTableLength):
+                if rowIndex % tileSize == 0:
+                    band = [array.array('d', tileBytes) for tileColumn in range(rowIndex // tileSize + 1)]
+                row = next(distanceReader, [])
+                rowOffset = (rowIndex % tileSize) * tileSize
+                for columnIndex in range(min(rowIndex + 1, len(row))):
+                    if row[columnIndex]:
+                        band[columnIndex // tileSize][rowOffset + columnIndex % tileSize] = float(row[columnIndex])
+                if rowIndex % tileSize == tileSize - 1 or rowIndex == addressTableLength - 1:
+                    for tile in band:
+                        tilesFile.write(tile.tobytes())
+        os.replace(temporaryFileName, tilesFileName)
+    finally:
+        if os.path.exists(temporaryFileName):
+            os.remove(temporaryFileName)
+
+# build the tile file unless it already exists and was built from the csv file as it is now with the same tile size
+def ensureDistanceTiles(fileName, tilesFileName, addressTableLength, tileSize, fileStat):
+    expectedHeader = (DISTANCE_TILES_MAGIC, addressTableLength, tileSize, fileStat.st_mtime_ns, fileStat.st_size)
+    header = b''
+    if os.path.exists(tilesFileName):
+        with open(tilesFileName, mode='rb') as file:
+            header = file.read(DISTANCE_TILES_HEADER.size)
+    if len(header) != DISTANCE_TILES_HEADER.size or DISTANCE_TILES_HEADER.unpack(header) != expectedHeader:
+        saveDistanceTiles(fileName, tilesFileName, addressTableLength, tileSize, fileStat)
+
+# load the distance table as a tiled distance table backed by a tile file next to the csv file, building the tile file first if it is missing or the csv file has changed since it was built
+# unlike the dense cache, the tiles can't be skipped when the csv folder is read only or full, so the tile file is built in the temporary folder instead and a warning says where
+def loadTiledDistanceData(addressTableLength, fileName='csv/distanceCSV.csv', tileSize=64, cacheTiles=1024):
+    tilesFileName = os.path.splitext(fileName)[0] + '.tiles'
+    fileStat = os.stat(fileName)
+    try:
+        ensureDistanceTiles(fileName, tilesFileName, addressTableLength, tileSize, fileStat)
+    except OSError as error:
+        fallbackFileName = os.path.join(tempfile.gettempdir(), f"{os.path.splitext(os.path.basename(fileName))[0]}.{fileStat.st_dev}.{fileStat.st_ino}.tiles")
+        print(f"Warning: could not build the distance tiles at {tilesFileName} ({error}), using {fallbackFileName} instead")
+        print()
+        tilesFileName = fallbackFileName
+        ensureDistanceTiles(fileName, tilesFileName, addressTableLength, tileSize, fileStat)
+    return TiledDistanceTable(addressTableLength, tileSize, DistanceTileFile(tilesFileName, tileSize), cacheTiles)
+
+# build a tiled distance table that computes its tiles from the (x, y) coordinates in miles of every address instead of reading them from a file
+def coordinateDistanceTable(points, tileSize=8, cacheTiles=65536):
+    return TiledDistanceTable(len(points), tileSize, CoordinateDistanceTiles(points, tileSize), cacheTiles)
+
+
+# the manifest is streamed from the csv file and added to the package store in chunks of chunkSize packages, so the whole manifest never has to be held as parsed rows at once
+# every package starts out at the hub, packages that arrive late are marked as delayed by the fleet engine from the event data
+def loadPackageData(addressTable, fileName='csv/packageCSV.csv', chunkSize=10000): # load the columnar package store with data read from the packageCSV file
+    packageTable = PackageStore(addressTable)
+    packages = list()
+    with open(fileName, mode='r', encoding='utf-8-sig') as file:
         packageReader = csv.reader(file)
         for row in packageReader:
-            package = Package(int(row[0]), row[1], addressTable.index(
-                row[1]), row[2], row[3], row[4], row[5], int(row[6]), 'At hub', 'N/A')
-            # these specific packages are delayed on flight and will not arrive to the depot until 9:05AM
-            # at 9:05:00 on the dot, the package is at the hub but not en route
-            # after 9:05:00, such as at 9:05:01, the packages are immediately loaded onto Truck 2 and then considered en route towards their destination
-            if package.packID in [6, 25, 28, 32] and userSeconds < 3900:
-                package.status = 'Delayed on flight'
-            packageTable.add(package)
+            packages.append((int(row[0]), addressTable.index(row[1]), row[2], row[3], row[4], row[5], int(row[6]), AT_HUB)) # the address table looks up the address index in O(1)
+            if len(packages) == chunkSize:
+                packageTable.addAll(packages)
+                packages = list()
+    packageTable.addAll(packages)
     return packageTable
 
+# load the disruptions of the day from the eventCSV file, every row starts with the kind of event and the time it happens
+# truck,HH:MM:SS,truck ID is the time a truck and a driver become available, a truck without a row is available at 8:00:00
+# arrival,HH:MM:SS,package ID is a package that only arrives at the hub at that time, for example because its flight was delayed
+# address,HH:MM:SS,package ID,address,city,state,zipcode is an address correction for a package that becomes known at that time
+# the events are returned as tuples of (kind, seconds, ...) with the rest of the row converted to the right types
+def loadEventData(fileName='csv/eventCSV.csv'):
+    events = list()
+    with open(fileName, mode='r', encoding='utf-8-sig') as file:
+        eventReader = csv.reader(file)
+        for row in eventReader:
+            if not row:
+                continue
+            kind = row[0].strip()
+            seconds = convertTimeToSeconds(row[1])
+            if kind == 'truck' or kind == 'arrival':
+                events.append((kind, seconds, int(row[2])))
+            elif kind == 'address':
+                events.append((kind, seconds, int(row[2]), row[3], row[4], row[5], row[6]))
+            else:
+                raise ValueError(f"unknown event {kind!r} in {fileName}")
+    return events
+
 # this function converts a time string between 8:00:00 and 17:00:00 to seconds which is used by the program to keep track of time during deliveries and used for other calculations
 # 8:00:00 turns into 0 seconds
 # 17:00:00 turns into 32400 seconds
@@ -175,27 +1117,39 @@ def convertTimeToSeconds(userTime):
     userSeconds = (hours - 8) * 3600 + minutes * 60 + seconds
     return userSeconds
 
-# this function edits the address for a specific package identified by its package ID after it has been loaded on a specific truck
-def editAddress(packID, truck, editAddress, editSeconds, userSeconds, packageTable):
-    if userSeconds > editSeconds: # only make the edit to the address if the user asks for the status of packages after a certain time
-        editPackage = packageTable.get(packID)
+# this function converts a deadline from the package csv file such as '10:30 AM' or 'EOD' to seconds after 8:00:00 so it can be compared with delivery times
+def convertDeadlineToSeconds(deadline):
+    if deadline == 'EOD':
+        return END_OF_DAY_SECONDS
+    clock, meridiem = deadline.split()
+    hours, minutes = map(int, clock.split(':'))
+    if meridiem == 'PM' and hours != 12:
+        hours += 12
+    elif meridiem == 'AM' and hours == 12:
+        hours = 0
+    return (hours - 8) * 3600 + minutes * 60
+
+# this function edits the address for a specific package identified by its package ID, truck is the truck the package is loaded on or None if it is not on a truck
+def editAddress(packID, truck, editAddress, editSeconds, packageTable, eventLog=None):
+    editRow = packageTable.row(packID)
 
-        oldAddressIndex = editPackage.addressIndex
+    if truck is not None:
+        oldAddressIndex = packageTable.addressIndexes[editRow]
         counter = 0
-        for package in truck.cargo: # after the address has been edited, we need to remove the old address from the list of places the truck has to visit but only do so if the old address had only one package that needed to be delivered to that location
-            if package.addressIndex == oldAddressIndex:
+        for row in truck.cargo: # after the address has been edited, we need to remove the old address from the list of places the truck has to visit but only do so if the old address had only one package that needed to be delivered to that location
+            if packageTable.addressIndexes[row] == oldAddressIndex:
                 counter += 1
         if counter == 1:
             truck.addresses.remove(oldAddressIndex)
-
-        editPackage.address = editAddress[0]
-        editPackage.addressIndex = editAddress[1]
-        editPackage.city = editAddress[2]
-        editPackage.state = editAddress[3]
-        editPackage.zipcode = editAddress[4]
         truck.addresses.add(editAddress[1]) # add the new address of the edited package to the list of places the truck has to visit
-        print(f"Package {packID}'s address has been successfully edited!")
-        print()
+        if truck.route is not None:
+            truck.unplannedStops.append(editAddress[1])
+        truck.edits.append(packID)
+
+    # editAddress holds the address text, address index, city, state and zipcode, the store looks the address text up from the address index
+    packageTable.setAddress(editRow, editAddress[1], editAddress[2], editAddress[3], editAddress[4])
+    if eventLog is not None: # the edit is only visible to a user time strictly after the edit time, so it is logged one second later
+        eventLog.append((editSeconds + 1, 'edit', truck.truID if truck is not None else None, packID, tuple(editAddress)))
 
 # this function converts seconds which are used by the truck object to a time string between 8:00:00 and 17:00:00 for display to the user
 # 0 seconds corresponds to 8:00:00
@@ -207,13 +1161,391 @@ def convertSecondsToTime(elapsedSeconds):
     seconds = totalSeconds % 60
     return f"{hours}:{minutes:02d}:{seconds:02d}"
 
+# the fleet engine is a discrete-event scheduler that runs any number of trucks on one global clock
+# every action is pushed onto a priority queue keyed by the first user time at which its effect is visible, the same convention the delivery timeline uses
+# a departure at d is visible from d + 1 and an address correction at e from e + 1, while a delivery or a hub arrival at t is visible from t
+# the engine pops actions in time order until the next one is past userSeconds, and when two actions share a second the disruptions go first so a truck leaving at 10:20:00 already sees a 10:20:00 address correction
+# when a truck arrives at a stop it delivers its packages and immediately picks its next stop, scheduling its arrival there, so the trucks interleave on the clock instead of running one after another
+class FleetEngine:
+    DISRUPTION = 0 # priority of hub arrivals and address corrections
+    TRUCK = 1 # priority of truck departures and arrivals at stops
+
+    # truckCargo is a list of (truck ID, list of package IDs, departure seconds) tuples in the order the trucks should be reported, disruptions is the list returned by loadEventData
+    # a departure of None means the truck leaves at the time the event data says it becomes available
+    # when improveRoutes is True, every truck plans its route with Truck.improveRoute right before it departs, spending at most routeSeconds on each truck
+    # every truck holds at most maxPackages packages, and a load with more raises a ValueError
+    # when counters is True, every truck counts its hot path with Truck.enableCounters and run times itself, see counterReport
+    def __init__(self, packageTable, distanceTable, truckCargo, disruptions, userSeconds, eventLog=None, improveRoutes=False, routeSeconds=0.05, maxPackages=TRUCK_MAX_PACKAGES, counters=False):
+        self.packageTable = packageTable
+        self.distanceTable = distanceTable
+        self.userSeconds = userSeconds
+        self.eventLog = eventLog
+        self.queue = list()
+        self.sequence = 0 # breaks ties between actions with the same time and priority in the order they were scheduled
+        self.edits = list() # package IDs whose address was corrected while they were not loaded on any truck
+        self.rejectedEdits = list() # package IDs whose address correction came after they were delivered
+        self.improveRoutes = improveRoutes
+        self.routeSeconds = routeSeconds
+        self.routeMiles = [0, 0] # miles of the planned routes of the departed trucks, driven nearest neighbor and as improved
+        self.routeImprovementSeconds = 0 # wall-clock seconds spent improving routes
+        self.counters = counters
+        self.runSeconds = 0.0 # wall-clock seconds spent in run, only measured when counters is True
+
+        availability = dict()
+        hubArrivals = dict() # maps the row of a late package to the time it arrives at the hub
+        for disruption in disruptions:
+            kind, seconds = disruption[0], disruption[1]
+            if kind == 'truck':
+                availability[disruption[2]] = seconds
+            elif kind == 'arrival':
+                row = packageTable.row(disruption[2])
+                packageTable.statuses[row] = DELAYED_ON_FLIGHT # at the arrival time on the dot the package is at the hub, until then it is delayed
+                hubArrivals[row] = max(hubArrivals.get(row, seconds), seconds)
+                self.schedule(seconds, self.DISRUPTION, self.arriveAtHub, row, seconds)
+            elif kind == 'address':
+                packID, address, city, state, zipcode = disruption[2:]
+                editFields = [address, packageTable.addressTable.index(address), city, state, zipcode]
+                self.schedule(seconds + 1, self.DISRUPTION, self.correctAddress, packID, editFields, seconds)
+
+        # a truck leaves once it is available and every package loaded onto it has arrived at the hub
+        self.trucks = list()
+        self.cargoTrucks = dict() # maps the row of a loaded package to the truck carrying it
+        for truID, packsID, departureSeconds in truckCargo:
+            truck = Truck(truID, 0, userSeconds, packsID, packageTable, eventLog, False, maxPackages)
+            if departureSeconds is None:
+                departureSeconds = availability.get(truID, 0)
+            for row in truck.cargo:
+                departureSeconds = max(departureSeconds, hubArrivals.get(row, departureSeconds))
+                self.cargoTrucks[row] = truck
+            truck.departureSeconds = departureSeconds
+            truck.departureTime = convertSecondsToTime(departureSeconds)
+            if counters:
+                truck.enableCounters()
+            self.trucks.append(truck)
+            self.schedule(departureSeconds + 1, self.TRUCK, self.departTruck, truck)
+
+    def schedule(self, seconds, priority, action, *arguments):
+        heapq.heappush(self.queue, (seconds, priority, self.sequence, action, arguments))
+        self.sequence += 1
+
+    # process every action that is visible at userSeconds and return the trucks
+    def run(self):
+        startTime = time.perf_counter() if self.counters else None
+        queue = self.queue
+        while queue and queue[0][0] <= self.userSeconds:
+            seconds, priority, sequence, action, arguments = heapq.heappop(queue)
+            action(*arguments)
+        if startTime is not None:
+            self.runSeconds += time.perf_counter() - startTime
+        return self.trucks
+
+    def arriveAtHub(self, row, arrivalSeconds):
+        if self.packageTable.statuses[row] == DELAYED_ON_FLIGHT:
+            self.packageTable.statuses[row] = AT_HUB
+            if self.eventLog is not None:
+                self.eventLog.append((arrivalSeconds, 'release', None, self.packageTable.packIDs[row], None))
+
+    # a correction that arrives after the package was delivered can't change where it went, so it is skipped instead of rewriting the delivered package
+    # the skip is reported with the fleet messages of the truck that delivered the package, and logged so the delivery timeline reports it at the same time
+    def correctAddress(self, packID, editFields, editSeconds):
+        row = self.packageTable.row(packID)
+        if self.packageTable.statuses[row] == DELIVERED:
+            self.rejectedEdits.append(packID)
+            if self.eventLog is not None: # like an edit, the skip is only visible to a user time strictly after the edit time
+                self.eventLog.append((editSeconds + 1, 'rejectedEdit', self.packageTable.truckIDs[row], packID, None))
+            return
+        truck = self.cargoTrucks.get(row)
+        if truck is None or row not in truck.cargo:
+            truck = None
+            self.edits.append(packID)
+        editAddress(packID, truck, editFields, editSeconds, self.packageTable, self.eventLog)
+
+    def departTruck(self, truck):
+        if self.improveRoutes:
+            startTime = time.perf_counter()
+            plannedMiles = truck.improveRoute(self.distanceTable, self.routeSeconds)
+            self.routeImprovementSeconds += time.perf_counter() - startTime
+            if plannedMiles is not None: # a truck that ran out of time before it had a starting order drives nearest neighbor and saves nothing
+                self.routeMiles[0] += plannedMiles[0]
+                self.routeMiles[1] += plannedMiles[1]
+        truck.depart()
+        self.driveOn(truck)
+
+    # send the truck to its nearest remaining stop, or back to the hub once it has delivered everything
+    def driveOn(self, truck):
+        if len(truck.cargo) > 0:
+            minDeliveryIndex, minDeliveryDistance, minDeliverySeconds = truck.nextStop(self.distanceTable)
+            self.schedule(truck.elapsedSeconds + minDeliverySeconds, self.TRUCK, self.arriveAtStop, truck, minDeliveryIndex, minDeliveryDistance, minDeliverySeconds)
+        else:
+            truck.recall(self.distanceTable)
+
+    def arriveAtStop(self, truck, minDeliveryIndex, minDeliveryDistance, minDeliverySeconds):
+        truck.arrive(minDeliveryIndex, minDeliveryDistance, minDeliverySeconds)
+        self.driveOn(truck)
+
+    # return the state of every truck as a list of dictionaries in the same shape as DeliveryTimeline.fleetAt
+    def fleet(self):
+        return [{'truID': truck.truID, 'departureTime': truck.departureTime if truck.departed else None, 'recallTime': truck.recallTime if truck.recallTime != 'N/A' else None,
+                 'mileage': truck.mileage, 'delivered': truck.delivered, 'edits': truck.edits,
+                 'rejectedEdits': [packID for packID in self.rejectedEdits if self.cargoTrucks[self.packageTable.row(packID)] is truck]} for truck in self.trucks]
+
+    # return the counters of every truck added up, with the seconds and stops per second of the whole run instead of the seconds of each truck, or None if counting is not enabled
+    def counterReport(self):
+        if not self.counters:
+            return None
+        report = dict()
+        for truck in self.trucks:
+            for name, value in truck.counterReport().items():
+                report[name] = report.get(name, 0) + value
+        report['seconds'] = self.runSeconds
+        report['stopsPerSecond'] = report['stops'] / self.runSeconds if self.runSeconds > 0 else 0.0
+        return report
+
+    def printCounters(self):
+        report = self.counterReport()
+        print(f"Fleet counters: {report['candidateStops']} candidate stops scanned, {report['distanceLookups']} distance lookups, "
+              f"{report['bestStopChanges']} best stop changes, {report['stops']} stops in {report['seconds']:.4f} seconds, {report['stopsPerSecond']:.0f} stops per second")
+        print()
+
+    # print how many miles route improvement saved on the trucks that have departed so far and how long it took
+    def printRouteImprovement(self):
+        nearestNeighborMiles, improvedMiles = self.routeMiles
+        print(f"Route improvement saved {nearestNeighborMiles - improvedMiles:.1f} of {nearestNeighborMiles:.1f} planned miles in {self.routeImprovementSeconds:.4f} seconds")
+        print()
+
+# load the hand-typed load plan from the truckCSV file, every row is a truck ID followed by the package IDs loaded onto that truck
+# the trucks leave at the time the event data says they become available, and None is returned if there is no load plan file
+def loadTruckCargoData(fileName='csv/truckCSV.csv'):
+    if not os.path.exists(fileName):
+        return None
+    truckCargo = list()
+    with open(fileName, mode='r', encoding='utf-8-sig') as file:
+        truckReader = csv.reader(file)
+        for row in truckReader:
+            if row:
+                truckCargo.append((int(row[0]), [int(packID) for packID in row[1:]], None))
+    return truckCargo
+
+# drive a load the same nearest neighbor way the truck will and return the seconds after departure at which it reaches every address, along with the seconds the whole trip takes back to the hub
+def driveNearestNeighbor(addressIndexes, distanceTable):
+    remaining = set(addressIndexes)
+    arrivalSeconds = dict()
+    currentAddress = 0
+    tripSeconds = 0
+    while remaining:
+        distanceRow = distanceTable.row(currentAddress)
+        nextAddress = min(remaining, key=distanceRow.__getitem__)
+        tripSeconds += distanceTable.travelSeconds(currentAddress, nextAddress)
+        arrivalSeconds[nextAddress] = tripSeconds
+        remaining.remove(nextAddress)
+        currentAddress = nextAddress
+    return arrivalSeconds, tripSeconds + distanceTable.travelSeconds(currentAddress, 0)
+
+# estimate how many seconds a truck needs to deliver a load and return to the hub by driving it the same nearest neighbor way the truck will
+def estimateTripSeconds(addressIndexes, distanceTable):
+    return driveNearestNeighbor(addressIndexes, distanceTable)[1]
+
+# check whether a truck leaving the hub at departureSeconds and driving the stops of the route in nearest neighbor order, the order the truck really drives them in, reaches every stop by its earliest deadline
+def meetsDeadlines(route, departureSeconds, distanceTable):
+    arrivalSeconds = driveNearestNeighbor([stop[0] for stop in route], distanceTable)[0]
+    return all(departureSeconds + arrivalSeconds[addressIndex] <= deadline for addressIndex, ready, deadline, rows in route)
+
+# return the stops of the route a truck leaving the hub at departureSeconds reaches after their earliest deadline when it drives them in nearest neighbor order
+def lateRouteStops(route, departureSeconds, distanceTable):
+    arrivalSeconds = driveNearestNeighbor([stop[0] for stop in route], distanceTable)[0]
+    return [stop for stop in route if departureSeconds + arrivalSeconds[stop[0]] > stop[2]]
+
+# number of packages on the given stops
+def countPackages(stops):
+    return sum(len(stop[3]) for stop in stops)
+
+# merge the given stops into routes with the Clarke-Wright savings algorithm, every stop is a tuple of (address index, ready seconds, earliest deadline, package rows)
+# joining the end of one route to the start of another saves hub-to-i + hub-to-j - i-to-j miles, so the pairs with the biggest savings are joined first
+# a merge is skipped if the route would hold more than maxPackages packages or if leaving once every package on it is ready would miss a deadline on it
+def buildSavingsRoutes(stops, distanceTable, maxPackages):
+    hubRow = distanceTable.row(0)
+    savings = list()
+    for i in range(len(stops)):
+        distanceRow = distanceTable.row(stops[i][0])
+        for j in range(i + 1, len(stops)):
+            saving = hubRow[stops[i][0]] + hubRow[stops[j][0]] - distanceRow[stops[j][0]]
+            if saving > 0:
+                savings.append((saving, i, j))
+    savings.sort(key=lambda pair: pair[0], reverse=True)
+
+    routes = [[stop] for stop in range(len(stops))] # every route is a list of indexes into stops
+    routeOf = list(range(len(stops))) # index of the route each stop is on
+    packageCounts = [len(stop[3]) for stop in stops]
+    readySeconds = [stop[1] for stop in stops]
+    for saving, i, j in savings:
+        first, second = routeOf[i], routeOf[j]
+        if first == second or packageCounts[first] + packageCounts[second] > maxPackages:
+            continue
+        firstRoute, secondRoute = routes[first], routes[second]
+        if firstRoute[-1] != i: # i has to be at the end of its route and j at the start of its route, so turn the routes around if needed
+            if firstRoute[0] != i:
+                continue
+            firstRoute = firstRoute[::-1]
+        if secondRoute[0] != j:
+            if secondRoute[-1] != j:
+                continue
+            secondRoute = secondRoute[::-1]
+        mergedRoute = firstRoute + secondRoute
+        mergedReady = max(readySeconds[first], readySeconds[second])
+        if not meetsDeadlines([stops[stop] for stop in mergedRoute], mergedReady, distanceTable):
+            continue
+        routes[first] = mergedRoute
+        routes[second] = None
+        for stop in secondRoute:
+            routeOf[stop] = first
+        packageCounts[first] += packageCounts[second]
+        readySeconds[first] = mergedReady
+    return [[stops[stop] for stop in route] for route in routes if route is not None]
+
+# the load planner assigns the packages of the manifest to truck loads automatically instead of using the hand-typed load plan
+# 1) packages that go to the same address and are ready to leave the hub at the same time become one stop, split up if there are more than maxPackages of them
+#    a package is ready once it has arrived at the hub and any address correction for it is known, and it is planned at its corrected address
+# 2) the stops are put into spatial buckets around anchor addresses picked by farthest point sampling, so a stop is only ever compared with the other stops in its bucket instead of with every stop
+# 3) within each bucket the stops are merged into routes of at most maxPackages packages with the savings algorithm
+# 4) the routes are handed out earliest deadline first, each to the truck that can leave the soonest, and a truck that already has a load takes another one as a new trip once its estimated return time has passed
+#    the deadlines of a route are checked again at the departure time of the truck it is handed to, driving the stops in the nearest neighbor order the truck really uses,
+#    and when some of its stops would be late they are split off as their own route and both parts go back into the queue, but only if the split gets more packages there in time,
+#    when the morning deadlines need more trips than the fleet can drive before them no split helps and the route is loaded as it is
+# each trip is reported as its own truck, the same way truck 3 of the hand-typed plan is really a second trip, so trips after the first one of a truck get the next unused truck ID
+# returns a list of (truck ID, list of package IDs, departure seconds) tuples sorted by truck ID
+def planLoads(packageTable, distanceTable, disruptions, maxPackages=TRUCK_MAX_PACKAGES, bucketStops=64):
+    readySeconds = dict() # maps the row of a package that arrives late or waits for an address correction to the time it is ready to leave the hub
+    plannedAddresses = dict() # maps the row of a package with an address correction to its corrected address index
+    availability = list() # (available seconds, truck ID) of every truck in the event data
+    for disruption in disruptions:
+        if disruption[0] == 'arrival' or disruption[0] == 'address':
+            row = packageTable.row(disruption[2])
+            readySeconds[row] = max(readySeconds.get(row, disruption[1]), disruption[1])
+            if disruption[0] == 'address':
+                plannedAddresses[row] = packageTable.addressTable.index(disruption[3])
+        elif disruption[0] == 'truck':
+            availability.append((disruption[1], disruption[2]))
+    if not availability:
+        availability.append((0, 1))
+
+    deadlineSeconds = packageTable.deadlineSeconds
+    stopRows = dict()
+    for row in packageTable.index:
+        stopRows.setdefault((plannedAddresses.get(row, packageTable.addressIndexes[row]), readySeconds.get(row, 0)), []).append(row)
+    stops = list()
+    for (addressIndex, ready), rows in stopRows.items():
+        rows.sort(key=deadlineSeconds.__getitem__) # when a stop is split, the most urgent packages stay together
+        for start in range(0, len(rows), maxPackages):
+            chunk = rows[start:start + maxPackages]
+            stops.append((addressIndex, ready, deadlineSeconds[chunk[0]], chunk))
+
+    # farthest point sampling, every new anchor is the stop farthest from all anchors picked so far, and every stop remembers its nearest anchor
+    anchorCount = max(1, math.ceil(len(stops) / bucketStops))
+    nearestDistances = [math.inf] * len(stops)
+    buckets = [0] * len(stops)
+    hubRow = distanceTable.row(0)
+    anchor = max(range(len(stops)), key=lambda stop: hubRow[stops[stop][0]], default=None)
+    for bucket in range(anchorCount):
+        if anchor is None or nearestDistances[anchor] == 0:
+            break
+        anchorRow = distanceTable.row(stops[anchor][0])
+        for stop in range(len(stops)):
+            distance = anchorRow[stops[stop][0]]
+            if distance < nearestDistances[stop]:
+                nearestDistances[stop] = distance
+                buckets[stop] = bucket
+        anchor = max(range(len(stops)), key=nearestDistances.__getitem__)
+    bucketStopLists = dict()
+    for stop in range(len(stops)):
+        bucketStopLists.setdefault(buckets[stop], []).append(stops[stop])
+
+    routes = list()
+    for bucketStopList in bucketStopLists.values():
+        routes.extend(buildSavingsRoutes(bucketStopList, distanceTable, maxPackages))
+    routeQueue = [(min(stop[2] for stop in route), max(stop[1] for stop in route), sequence, route) for sequence, route in enumerate(routes)]
+    heapq.heapify(routeQueue)
+    sequence = len(routeQueue) # breaks ties between split routes in the order they were split
+
+    trucks = [[availableSeconds, truID, False] for availableSeconds, truID in sorted(availability)] # free seconds, truck ID and whether the truck already has a load
+    nextTripID = max(truID for availableSeconds, truID in availability) + 1
+    truckCargo = list()
+    while routeQueue:
+        deadline, ready, order, route = heapq.heappop(routeQueue)
+        truck = min(trucks, key=lambda truck: (max(truck[0], ready), truck[2], truck[0])) # the truck that can leave the soonest, preferring a truck that has no load yet
+        departureSeconds = max(truck[0], ready)
+        # every other truck leaves at the same time or later, so the route can't do better than on this truck, but if some of its stops would be late,
+        # taking them off and sending them as their own trip on the truck that can leave next may get more packages there in time
+        lateStops = lateRouteStops(route, departureSeconds, distanceTable)
+        if lateStops and len(lateStops) < len(route):
+            onTimeStops = [stop for stop in route if stop not in lateStops]
+            onTimeLate = lateRouteStops(onTimeStops, departureSeconds, distanceTable)
+            truckFree = truck[0]
+            truck[0] = departureSeconds + estimateTripSeconds([stop[0] for stop in onTimeStops], distanceTable)
+            nextDeparture = min(max(otherTruck[0], ready) for otherTruck in trucks)
+            truck[0] = truckFree
+            splitLate = lateRouteStops(lateStops, nextDeparture, distanceTable) + onTimeLate
+            if countPackages(splitLate) < countPackages(lateStops):
+                for part in (lateStops, onTimeStops):
+                    heapq.heappush(routeQueue, (min(stop[2] for stop in part), max(stop[1] for stop in part), sequence, part))
+                    sequence += 1
+                continue
+        if truck[2]:
+            tripID = nextTripID
+            nextTripID += 1
+        else:
+            tripID = truck[1]
+            truck[2] = True
+        truck[0] = departureSeconds + estimateTripSeconds([stop[0] for stop in route], distanceTable)
+        truckCargo.append((tripID, [packageTable.packIDs[row] for stop in route for row in stop[3]], departureSeconds))
+    truckCargo.sort(key=lambda load: load[0])
+    return truckCargo
+
+# return the truck loads for the day, read from the hand-typed load plan unless autoPlan is True or there is no load plan file, in which case the load planner creates them and reports how long it took
+def loadTruckCargo(packageTable, distanceTable, disruptions, autoPlan=False):
+    truckCargo = None if autoPlan else loadTruckCargoData()
+    if truckCargo is None:
+        planStart = time.perf_counter()
+        truckCargo = planLoads(packageTable, distanceTable, disruptions)
+        print(f"Load plan for {len(packageTable)} packages on {len(truckCargo)} trucks created in {time.perf_counter() - planStart:.3f} seconds")
+        print()
+    return truckCargo
+
+# print the address corrections, departures and returns visible to the user, grouped by truck in the order the trucks are listed
+# hubEdits are package IDs whose address was corrected while they were not on a truck, and fleet is a list of dictionaries as returned by FleetEngine.fleet or DeliveryTimeline.fleetAt
+def printFleetMessages(hubEdits, fleet):
+    for packID in hubEdits:
+        print(f"Package {packID}'s address has been successfully edited!")
+        print()
+    for truck in fleet:
+        for packID in truck['edits']:
+            print(f"Package {packID}'s address has been successfully edited!")
+            print()
+        for packID in truck['rejectedEdits']:
+            print(f"Package {packID} was already delivered by truck {truck['truID']}, so its address correction was skipped!")
+            print()
+        if truck['departureTime'] is not None:
+            print(f"Truck {truck['truID']} departed at {truck['departureTime']}")
+            print()
+        if truck['recallTime'] is not None:
+            print(f"Truck {truck['truID']} returned at {truck['recallTime']}")
+            print()
+
+# print the mileage of every truck and the total mileage, but only if every package has been delivered, meaning the simulation has been completed
+# truckMileages is a list of (truck ID, mileage) pairs
+def printMileage(truckMileages):
+    for truID, mileage in truckMileages:
+        print(f"Truck {truID} mileage: {mileage} miles")
+    print(f"The total mileage is: {round(sum(mileage for truID, mileage in truckMileages), 1)}")
+    print()
+
 # function simulates delivery of packages by first getting address data, distance data, and package data from the csv files
 # time is also kept track of in seconds, because the timeframe is 8:00:00-17:00:00, 8:00:00 corresponds to 0 seconds and 17:00:00 corresponds to 32400 seconds
-# after data from csv files are loaded, the truck objects are created using hard coded cargo lists, which means the trucks are manually loaded
-# each truck will then deliver all their packages and return to the hub
-# before truck 3 departs, the address for package ID 9 will be altered if the time given by the user is past 10:20:00
+# after data from csv files are loaded, the day is replayed up to the time given by the user
 # depending on the user options, information for a specific package or all packages will then be printed
-def startDeliveryProgram(userPackID, userTime, showMileage):
+# passing autoPlan=True lets the load planner decide which package goes on which truck instead of the hand-typed load plan
+# passing improveRoutes=True lets every truck improve the order of its stops before it departs instead of always driving to the nearest address
+# passing showCounters=True counts the stops the trucks scanned and made during the replay and prints them, see FleetEngine.counterReport
+def startDeliveryProgram(userPackID, userTime, showMileage, autoPlan=False, improveRoutes=False, showCounters=False):
     print("SIMULATION START")
     print()
 
@@ -225,40 +1557,28 @@ def startDeliveryProgram(userPackID, userTime, showMileage):
     distanceTable = loadDistanceData(len(addressTable))
     print("Distance table loaded!")
 
-    # get distance data from csv file and load it into a custom hash table (list of lists)
-    packageTable = loadPackageData(addressTable, convertTimeToSeconds(userTime))
+    # get package data from csv file and load it into the columnar package store
+    packageTable = loadPackageData(addressTable)
     print("Package table loaded!")
     print()
 
+    # get the truck availability, late hub arrivals and address corrections of the day from the event csv file
+    disruptions = loadEventData()
+
     # convert the amount of seconds (0 seconds = 8:00:00 and 32400 seconds = 17:00:00) back to a time string in the format HH:MM:SS for later use for display
     userSeconds = convertTimeToSeconds(userTime)
 
-    # since we have 40 package IDs, manually determine which package goes on which truck
-    truckOneCargo = [1, 4, 5, 7, 13, 14, 15,
-                     16, 19, 20, 29, 30, 31, 34, 37, 40]
-    truckTwoCargo = [2, 3, 6, 10, 11, 12, 18,
-                     25, 26, 27, 28, 32, 33, 35, 36, 38]
-    truckThreeCargo = [8, 9, 17, 21, 22, 23, 24, 39]
-
-    # create truck objects and pass in 0 seconds for truck 1 since it can leave immediately at 8:00:00, pass in 3900 seconds for truck 2 since it can't leave until 9:05:00, and pass in 8400 seconds for truck 3 since it can't leave until 10:20:00
-    truckOne = Truck(1, 0, userSeconds, truckOneCargo, packageTable)
-    truckTwo = Truck(2, 3900, userSeconds, truckTwoCargo, packageTable)
-    truckThree = Truck(3, 8400, userSeconds, truckThreeCargo, packageTable)
-
-    # truck 1 deliver and return to hub
-    truckOne.deliver(distanceTable)
-    truckOne.recall(distanceTable)
-
-    # truck 2 deliver and return to hub
-    truckTwo.deliver(distanceTable)
-    truckTwo.recall(distanceTable)
+    # load the trucks from the hand-typed load plan or the load planner
+    truckCargo = loadTruckCargo(packageTable, distanceTable, disruptions, autoPlan)
 
-    # before truck 3 departs, edit the address if possible
-    editAddress(9, truckThree, ['410 S State St', addressTable.index('410 S State St'), 'Salt Lake City', 'UT', '84111'], convertTimeToSeconds('10:20:00'), userSeconds, packageTable)
-
-    # truck 3 deliver and depart
-    truckThree.deliver(distanceTable)
-    truckThree.recall(distanceTable)
+    engine = FleetEngine(packageTable, distanceTable, truckCargo, disruptions, userSeconds, improveRoutes=improveRoutes, counters=showCounters)
+    trucks = engine.run()
+    distanceTable.close()
+    if improveRoutes:
+        engine.printRouteImprovement()
+    if showCounters:
+        engine.printCounters()
+    printFleetMessages(engine.edits, engine.fleet())
 
     # determine whether to print information regarding all packages or just one specific package
     if userPackID == -1:
@@ -267,17 +1587,350 @@ def startDeliveryProgram(userPackID, userTime, showMileage):
         packageTable.printPackage(userPackID)
 
     # if every package has been delivered, it means the simulation has been completed, and if showMileage is True, print out the mileage 
-    if len(truckOne.cargo) == 0 and len(truckTwo.cargo) == 0 and len(truckThree.cargo) == 0 and showMileage:
-        print(f"Truck 1 mileage: {truckOne.mileage} miles")
-        print(f"Truck 2 mileage: {truckTwo.mileage} miles")
-        print(f"Truck 3 mileage: {truckThree.mileage} miles")
-        print(f"The total mileage is: {round(truckOne.mileage + truckTwo.mileage + truckThree.mileage, 1)}")
+    if all(len(truck.cargo) == 0 for truck in trucks) and showMileage:
+        printMileage([(truck.truID, truck.mileage) for truck in trucks])
+
+
+# the delivery timeline simulates the full day once and keeps a compact, time-sorted event log of departures, deliveries, returns, address edits, skipped address edits and flight-delay releases
+# every event is stored as (seconds, kind, truID, subject, detail) where seconds is the first user time at which the event is visible, so a query at userSeconds sees exactly the events with seconds <= userSeconds
+# the log is also split per package and per truck so that answering "where was package X at time T" or "where was the fleet at time T" is a binary search instead of a full replay of the day
+class DeliveryTimeline:
+    def __init__(self, autoPlan=False, improveRoutes=False, showCounters=False):
+        addressTable = loadAddressData()
+        distanceTable = loadDistanceData(len(addressTable))
+        packageTable = loadPackageData(addressTable)
+        disruptions = loadEventData()
+        truckCargo = loadTruckCargo(packageTable, distanceTable, disruptions, autoPlan)
+
+        self.events = list()
+        engine = FleetEngine(packageTable, distanceTable, truckCargo, disruptions, math.inf, self.events, improveRoutes, counters=showCounters) # run the day with no time limit so every event is recorded
+        self.packageTable = copy.deepcopy(packageTable) # snapshot of every package before the day starts, with the late packages already marked as delayed by the engine
+        self.packageOrder = [packageTable.packIDs[row] for row in packageTable.index] # package IDs in the order the package store prints them
+        trucks = engine.run()
+        distanceTable.close() # every answer comes from the event log, so the distances aren't needed after the day has run
+        if improveRoutes:
+            engine.printRouteImprovement()
+        if showCounters:
+            engine.printCounters()
+        self.truckIDs = [truck.truID for truck in trucks]
+        self.events.sort(key=lambda event: event[0]) # stable sort keeps events that share a second in the order they happened
+        self.eventSeconds = [event[0] for event in self.events]
+
+        # split the log into per package and per truck logs, each of which is still sorted by time
+        # address corrections of packages that were not on a truck go into their own log
+        self.packageEvents = {packID: ([], []) for packID in self.packageOrder}
+        self.truckEvents = {truID: ([], []) for truID in self.truckIDs}
+        self.hubEditSeconds = list()
+        self.hubEdits = list()
+        for event in self.events:
+            seconds, kind, truID, subject, detail = event
+            if kind == 'depart':
+                for packID in subject:
+                    self.packageEvents[packID][0].append(seconds)
+                    self.packageEvents[packID][1].append(event)
+            elif kind != 'return':
+                self.packageEvents[subject][0].append(seconds)
+                self.packageEvents[subject][1].append(event)
+            if truID is not None:
+                self.truckEvents[truID][0].append(seconds)
+                self.truckEvents[truID][1].append(event)
+            elif kind == 'edit':
+                self.hubEditSeconds.append(seconds)
+                self.hubEdits.append(subject)
+
+    # return a copy of the package as it looks at userSeconds by applying only the events of that package that happened by then
+    def packageAt(self, packID, userSeconds):
+        package = self.packageTable.get(packID)
+        eventSeconds, events = self.packageEvents[packID]
+        for seconds, kind, truID, subject, detail in events[:bisect.bisect_right(eventSeconds, userSeconds)]:
+            if kind == 'release':
+                package.status = 'At hub'
+            elif kind == 'depart':
+                package.status = f"En Route (Truck {truID})"
+            elif kind == 'edit':
+                package.address, package.addressIndex, package.city, package.state, package.zipcode = detail
+            elif kind == 'deliver':
+                package.status = f"Delivered (Truck {truID})"
+                package.deliveryTime = convertSecondsToTime(detail[0])
+        return package
+
+    # return the state of every truck at userSeconds as a list of dictionaries holding the departure time, return time, mileage, packages delivered, and address edits made and skipped so far
+    def fleetAt(self, userSeconds):
+        fleet = list()
+        for truID in self.truckIDs:
+            eventSeconds, events = self.truckEvents[truID]
+            truck = {'truID': truID, 'departureTime': None, 'recallTime': None, 'mileage': 0, 'delivered': 0, 'edits': [], 'rejectedEdits': []}
+            for seconds, kind, eventTruID, subject, detail in events[:bisect.bisect_right(eventSeconds, userSeconds)]:
+                if kind == 'depart':
+                    truck['departureTime'] = detail
+                elif kind == 'deliver':
+                    truck['delivered'] += 1
+                    truck['mileage'] = detail[1]
+                elif kind == 'return':
+                    truck['recallTime'], truck['mileage'] = detail
+                elif kind == 'edit':
+                    truck['edits'].append(subject)
+                elif kind == 'rejectedEdit':
+                    truck['rejectedEdits'].append(subject)
+            fleet.append(truck)
+        return fleet
+
+    # print the same answer the per-time replay in startDeliveryProgram prints, but without reloading or re-simulating anything
+    def report(self, userPackID, userTime, showMileage):
+        userSeconds = convertTimeToSeconds(userTime)
+        fleet = self.fleetAt(userSeconds)
+        printFleetMessages(self.hubEdits[:bisect.bisect_right(self.hubEditSeconds, userSeconds)], fleet)
+
+        if userPackID == -1:
+            for packID in self.packageOrder:
+                printPackageInfo(self.packageAt(packID, userSeconds))
+        else:
+            printPackageInfo(self.packageAt(userPackID, userSeconds))
         print()
 
+        # a truck is only recalled once all of its cargo is delivered, so every truck having returned means the simulation has been completed
+        if all(truck['recallTime'] is not None for truck in fleet) and showMileage:
+            printMileage([(truck['truID'], truck['mileage']) for truck in fleet])
+
+
+# load the scenario grid of a scenario sweep, every row is a setting name followed by the values to try for it
+# departures rows hold the departure time of every truck separated by semicolons, trucks rows the number of trucks, maxPackages rows the most packages on one truck
+# and cutoff rows the time the day is run up to, for example "departures,8:00:00;9:05:00" and "trucks,2,3"
+# every combination of the values becomes one (departure seconds per truck, truck count, max packages, cutoff seconds) scenario
+# when a scenario has more trucks than departure times, the extra trucks leave at the last departure time
+def loadScenarioGrid(fileName='csv/scenarioCSV.csv'):
+    grid = {'departures': [], 'trucks': [], 'maxPackages': [], 'cutoff': []}
+    with open(fileName, mode='r', encoding='utf-8-sig') as file:
+        scenarioReader = csv.reader(file)
+        for row in scenarioReader:
+            if not row:
+                continue
+            if row[0] == 'departures':
+                grid['departures'] += [tuple(convertTimeToSeconds(departureTime) for departureTime in value.split(';')) for value in row[1:]]
+            elif row[0] == 'cutoff':
+                grid['cutoff'] += [convertTimeToSeconds(value) for value in row[1:]]
+            else:
+                grid[row[0]] += [int(value) for value in row[1:]]
+    return list(itertools.product(grid['departures'] or [(0,)], grid['trucks'] or [3], grid['maxPackages'] or [TRUCK_MAX_PACKAGES], grid['cutoff'] or [END_OF_DAY_SECONDS]))
+
+# copy the dense distance table into one block of shared memory that the workers of a scenario sweep attach to instead of loading the distance csv file themselves
+# a tiled distance table is not copied, every worker gets its own tile cache over the same tile file or coordinates instead
+def shareDistanceTable(distanceTable):
+    sharedDistances = shared_memory.SharedMemory(create=True, size=max(8 * len(distanceTable) * len(distanceTable), 1))
+    for rowIndex in range(len(distanceTable)):
+        sharedDistances.buf[8 * len(distanceTable) * rowIndex:8 * len(distanceTable) * (rowIndex + 1)] = array.array('d', distanceTable.row(rowIndex)).tobytes()
+    return sharedDistances
+
+# state every worker process of a scenario sweep keeps between scenarios, set once by initializeSweepWorker
+sweepWorker = dict()
+
+# attach the worker to the shared distance table, or use the tiled distance table it was given, and keep the package store and disruptions it was given, so every scenario only copies the columns of the package store a day changes
+def initializeSweepWorker(sharedName, addressTableLength, packageTable, disruptions, tiledDistanceTable=None):
+    if tiledDistanceTable is not None:
+        sharedDistances = None
+        distanceTable = tiledDistanceTable
+    else:
+        sharedDistances = shared_memory.SharedMemory(name=sharedName)
+        distanceTable = MappedDistanceTable(sharedDistances.buf.cast('d'), addressTableLength)
+    sweepWorker.update(sharedDistances=sharedDistances, distanceTable=distanceTable,
+                       packageTable=packageTable, disruptions=[disruption for disruption in disruptions if disruption[0] != 'truck'])
+
+# run one scenario of a scenario sweep in a worker: the load planner loads the scenario's trucks, the fleet engine runs the day up to the cutoff time,
+# and the mileage, the return time of every truck (None if it is not back by the cutoff), the late packages and the undelivered packages are returned
+# a package is late if it was delivered after its deadline or if its deadline passed before the cutoff time without it being delivered
+def runScenario(scenario):
+    departures, truckCount, maxPackages, cutoffSeconds = scenario
+    packageTable = sweepWorker['packageTable'].copy()
+    distanceTable = sweepWorker['distanceTable']
+    disruptions = sweepWorker['disruptions'] + [('truck', departures[min(truID, len(departures)) - 1], truID) for truID in range(1, truckCount + 1)]
+    truckCargo = planLoads(packageTable, distanceTable, disruptions, maxPackages)
+    trucks = FleetEngine(packageTable, distanceTable, truckCargo, disruptions, cutoffSeconds, maxPackages=maxPackages).run()
+    latePackages = 0
+    undeliveredPackages = 0
+    for row in packageTable.index:
+        deliverySeconds, deadlineSeconds = packageTable.deliverySeconds[row], packageTable.deadlineSeconds[row]
+        if deliverySeconds == -1:
+            undeliveredPackages += 1
+            if deadlineSeconds < cutoffSeconds:
+                latePackages += 1
+        elif deliverySeconds > deadlineSeconds:
+            latePackages += 1
+    return {'scenario': scenario, 'mileage': round(sum(truck.mileage for truck in trucks), 1), 'trips': len(trucks),
+            'returnTimes': [truck.recallTime if truck.recallTime != 'N/A' else None for truck in trucks], 'latePackages': latePackages, 'undeliveredPackages': undeliveredPackages}
+
+# run every scenario on a pool of worker processes and return the results in the order of the scenarios
+# the distance table is copied into shared memory once, and the package store and disruptions are only sent to every worker once when it starts
+def runScenarioSweep(scenarios, packageTable, distanceTable, disruptions, processes=None):
+    tiledDistanceTable = distanceTable if isinstance(distanceTable, TiledDistanceTable) else None
+    sharedDistances = shareDistanceTable(distanceTable) if tiledDistanceTable is None else None
+    try:
+        with ProcessPoolExecutor(processes, initializer=initializeSweepWorker,
+                                 initargs=(sharedDistances.name if sharedDistances is not None else None, len(distanceTable), packageTable, disruptions, tiledDistanceTable)) as executor:
+            chunkSize = max(1, len(scenarios) // (4 * (processes or os.cpu_count() or 1))) # a few chunks per worker keeps the workers busy without sending every scenario on its own
+            return list(executor.map(runScenario, scenarios, chunksize=chunkSize))
+    finally:
+        if sharedDistances is not None:
+            sharedDistances.close()
+            sharedDistances.unlink()
+
+# print the results of a scenario sweep as one table with a row per scenario
+def printScenarioTable(results):
+    print(f"{'Departures':<28}{'Trucks':>7}{'Max':>5}{'Cutoff':>10}{'Mileage':>9}{'Trips':>7}{'Last Return':>13}{'Late':>6}{'Undelivered':>13}")
+    for result in results:
+        departures, truckCount, maxPackages, cutoffSeconds = result['scenario']
+        returnTimes = result['returnTimes']
+        lastReturn = max(returnTimes, key=convertTimeToSeconds) if returnTimes and None not in returnTimes else 'N/A'
+        departureTimes = ';'.join(convertSecondsToTime(departureSeconds) for departureSeconds in departures)
+        print(f"{departureTimes:<28}{truckCount:>7}{maxPackages:>5}{convertSecondsToTime(cutoffSeconds):>10}{result['mileage']:>9}{result['trips']:>7}{lastReturn:>13}{result['latePackages']:>6}{result['undeliveredPackages']:>13}")
+    print()
+
+# load the data of the day once, run every scenario of the scenario grid file in parallel and print the results table
+def startScenarioSweep(fileName='csv/scenarioCSV.csv', processes=None):
+    addressTable = loadAddressData()
+    distanceTable = loadDistanceData(len(addressTable))
+    packageTable = loadPackageData(addressTable)
+    disruptions = loadEventData()
+    scenarios = loadScenarioGrid(fileName)
+    startTime = time.perf_counter()
+    results = runScenarioSweep(scenarios, packageTable, distanceTable, disruptions, processes)
+    sweepSeconds = time.perf_counter() - startTime
+    distanceTable.close()
+    printScenarioTable(results)
+    print(f"Ran {len(scenarios)} scenarios in {sweepSeconds:.2f} seconds ({len(scenarios) / sweepSeconds:.1f} scenarios per second)")
+    print()
+
+
+# long-running status service that simulates the day once into a delivery timeline and answers status queries over HTTP with JSON bodies
+# GET /package?id=X&time=T answers where package X was at time T, GET /packages?time=T answers every package at time T and GET /mileage?time=T answers the mileage of every truck at time T
+# the time defaults to 17:00:00, every connection is handled by its own coroutine and kept alive between requests
+# the state of the day at time T only depends on how many events of the log are visible at T, so every answer is serialized once per visible event count and kept in a bounded cache
+class StatusService:
+    maxBodyBytes = 1024 # largest request body the service reads, every route is a GET that ignores its body
+
+    def __init__(self, timeline, cacheSize=1024):
+        self.timeline = timeline
+        self.cacheSize = cacheSize
+        self.cache = OrderedDict() # maps (path, package ID, visible event count) to the encoded JSON body, in least recently used order
+        self.routes = {'/package': self.packageAnswer, '/packages': self.packagesAnswer, '/mileage': self.mileageAnswer}
+
+    def packageAnswer(self, packID, userSeconds):
+        return self.timeline.packageAt(packID, userSeconds).__dict__
+
+    def packagesAnswer(self, packID, userSeconds):
+        return [self.timeline.packageAt(packID, userSeconds).__dict__ for packID in self.timeline.packageOrder]
+
+    def mileageAnswer(self, packID, userSeconds):
+        fleet = self.timeline.fleetAt(userSeconds)
+        return {'trucks': [{'truID': truck['truID'], 'mileage': truck['mileage'], 'recallTime': truck['recallTime']} for truck in fleet],
+                'totalMileage': round(sum(truck['mileage'] for truck in fleet), 1), 'completed': all(truck['recallTime'] is not None for truck in fleet)}
+
+    # return the HTTP status and the encoded JSON body answering the request target
+    def answer(self, target):
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        route = self.routes.get(url.path)
+        if route is None:
+            return 404, b'{"error": "unknown path"}'
+        try:
+            userSeconds = convertTimeToSeconds(query.get('time', ['17:00:00'])[0])
+            packID = int(query['id'][0]) if url.path == '/package' else None
+        except (KeyError, ValueError):
+            return 400, b'{"error": "expected a time in the format HH:MM:SS and, for /package, a package ID"}'
+        if packID is not None and packID not in self.timeline.packageEvents:
+            return 404, b'{"error": "unknown package ID"}'
+        cacheKey = (url.path, packID, bisect.bisect_right(self.timeline.eventSeconds, userSeconds))
+        body = self.cache.get(cacheKey)
+        if body is None:
+            body = json.dumps(route(packID, userSeconds)).encode()
+            self.cache[cacheKey] = body
+            if len(self.cache) > self.cacheSize:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(cacheKey)
+        return 200, body
+
+    # serve every request of one connection until the client closes it or asks to close it
+    async def handleConnection(self, reader, writer):
+        reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+        try:
+            while True:
+                requestLine = await reader.readline()
+                while requestLine in (b'\r\n', b'\n'): # empty lines before a request line are skipped, as HTTP/1.1 asks of a server
+                    requestLine = await reader.readline()
+                if not requestLine:
+                    break
+                keepAlive = True
+                contentLength = 0
+                badLength = None # the reason the Content-Length can't be accepted, if any, the request then gets a 400 and the connection is closed without reading the body
+                while True: # read the headers up to the empty line
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    if name.strip().lower() == 'connection':
+                        keepAlive = value.strip().lower() != 'close'
+                    elif name.strip().lower() == 'content-length':
+                        value = value.strip() or '0'
+                        if not value.isdigit():
+                            badLength = 'Content-Length must be a number'
+                        elif int(value) > self.maxBodyBytes: # a GET has no use for a body, so a large one is refused instead of being read into memory
+                            badLength = f"request bodies are limited to {self.maxBodyBytes} bytes"
+                        else:
+                            contentLength = int(value)
+                if badLength:
+                    keepAlive = False
+                elif contentLength:
+                    await reader.readexactly(contentLength)
+                parts = requestLine.decode('latin-1').split()
+                if badLength:
+                    status, body = 400, json.dumps({'error': badLength}).encode()
+                elif len(parts) < 2 or parts[0] != 'GET':
+                    status, body = 405, b'{"error": "only GET is supported"}'
+                else:
+                    status, body = self.answer(parts[1])
+                # the status line, headers and body go out in one write
+                writer.write(f"HTTP/1.1 {status} {reasons[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                             f"Connection: {'keep-alive' if keepAlive else 'close'}\r\n\r\n".encode() + body)
+                await writer.drain()
+                if not keepAlive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError): # readline raises ValueError for a line longer than the stream limit
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        server = await asyncio.start_server(self.handleConnection, host, port)
+        print(f"Status service listening on {host}:{server.sockets[0].getsockname()[1]}")
+        sys.stdout.flush()
+        async with server:
+            await server.serve_forever()
+
+# load the data and simulate the day once, then answer status queries until the process is stopped
+def startStatusService(host='127.0.0.1', port=8080, autoPlan=False, improveRoutes=False):
+    service = StatusService(DeliveryTimeline(autoPlan, improveRoutes))
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        print("Status service stopped!")
+
 
 # main function provides menu options and waits for user input to execute the delivery program under specific conditions and will loop back on itself to allow for other options to be chosen until 4 is chosen to quit out of the program
-def main():
+# when useTimeline is True, the full day is simulated once up front and every option is answered from the delivery timeline instead of replaying the day again
+# when autoPlan is True, the load planner decides which package goes on which truck instead of the hand-typed load plan in csv/truckCSV.csv
+# when improveRoutes is True, every truck improves the order of its stops with 2-opt and Or-opt moves before it departs
+# when showCounters is True, the fleet engine counts the stops the trucks scanned and made and prints them after every run of the day
+def main(useTimeline=False, autoPlan=False, improveRoutes=False, showCounters=False):
     userOption = None
+    if useTimeline:
+        runProgram = DeliveryTimeline(autoPlan, improveRoutes, showCounters).report
+    else:
+        def runProgram(userPackID, userTime, showMileage):
+            startDeliveryProgram(userPackID, userTime, showMileage, autoPlan, improveRoutes, showCounters)
     while True:
         print("Welcome to the delivery program!")
         print("Please input a number between 1-4 corresponding to the options below and press the enter key")
@@ -296,14 +1949,14 @@ def main():
             # this is the EOD time and the simulation should be completed by then and True is also passed to show total mileage for trucks
             print("Option 1 chosen!")
             print()
-            startDeliveryProgram(-1, '17:00:00', True)
+            runProgram(-1, '17:00:00', True)
         elif userOption == 2: # if option 2 is chosen, also ask the user for the specified time the simulation is allowed to run up to
             print("Option 2 chosen!")
             print()
             userTime = input(
                 "Please enter a time between 8:00:00 and 17:00:00 in the format 'HH:MM:SS' excluding the single quotes and press the enter key: ")
             print()
-            startDeliveryProgram(-1, userTime, False)
+            runProgram(-1, userTime, False)
         elif userOption == 3: # if option 3 is chosen, ask the user which specific package they want to know about by asking for package ID input and also ask the user for the specified time the simulation is allowed to run up to
             print("Option 3 chosen!")
             print()
@@ -312,7 +1965,7 @@ def main():
             userTime = input(
                 "Please enter a time between 8:00:00 and 17:00:00 in the format 'HH:MM:SS' excluding the single quotes and press the enter key: ")
             print()
-            startDeliveryProgram(int(userPackID), userTime, False)
+            runProgram(int(userPackID), userTime, False)
         elif userOption == 4: # if option 4 is chosen, exit out of the loop and the program is over
             print("Quitting the delivery program!")
             print()
@@ -321,5 +1974,14 @@ def main():
             print("Invalid input, please enter a number within the specified range")
             print()
 
-# executing python script calls the main function
-main()
\ No newline at end of file
+# executing python script calls the main function, passing --timeline answers every option from a single simulated day, passing --plan loads the trucks with the load planner
+# and passing --improve lets every truck improve the order of its stops before it departs
+# passing --sweep runs the scenario grid in csv/scenarioCSV.csv instead of the menu, and passing --serve followed by an optional port starts the status service instead of the menu
+if __name__ == '__main__':
+    if '--sweep' in sys.argv[1:]:
+        startScenarioSweep()
+    elif '--serve' in sys.argv[1:]:
+        portArguments = sys.argv[sys.argv.index('--serve') + 1:sys.argv.index('--serve') + 2]
+        startStatusService(port=int(portArguments[0]) if portArguments and portArguments[0].isdigit() else 8080, autoPlan='--plan' in sys.argv[1:], improveRoutes='--improve' in sys.argv[1:])
+    else:
+        main('--timeline' in sys.argv[1:], '--plan' in sys.argv[1:], '--improve' in sys.argv[1:], '--counters' in sys.argv[1:])